@@ -2,22 +2,57 @@
 from __future__ import annotations
 
 import asyncio
-from homeassistant.core import HomeAssistant
+from collections.abc import Mapping
+from typing import Any
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.config_entries import ConfigEntry
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.typing import ConfigType
 from homeassistant.const import (
     Platform,
     CONF_FRIENDLY_NAME,
 )
 import logging
 
+from .coordinator import async_get_coordinator
+from .decision_log import async_remove_log
 from .logic import Logic
 from .state import IntegrationState
 from .const import (
     DOMAIN,
+    DATA_COORDINATOR,
     CONF_WRAPPED_CLIMATE,
     CONF_TEMPERATURE_SENSOR,
     CONF_TEMPERATURE_VARIANCE,
+    CONF_UPDATE_DEBOUNCE,
+    CONF_CONTROL_MODE,
+    CONF_PREDICTIVE_LOOKAHEAD,
+    CONF_SENSOR_FILTER,
+    CONF_SENSOR_AGGREGATION,
+    CONF_SENSOR_WEIGHTS,
+    CONF_FILTER_MAX_RATE,
+    CONF_FILTER_THRESHOLD,
+    CONF_MIN_RUN_TIME,
+    CONF_MIN_IDLE_TIME,
+    CONF_WINDOW_THRESHOLD,
+    CONF_WINDOW_PAUSE,
+    CONF_WINDOW_SENSOR,
+    CONTROL_MODE_HYSTERESIS,
+    FILTER_NONE,
+    AGGREGATION_MEAN,
+    DEFAULT_UPDATE_DEBOUNCE,
+    DEFAULT_PREDICTIVE_LOOKAHEAD,
+    DEFAULT_FILTER_MAX_RATE,
+    DEFAULT_FILTER_THRESHOLD,
+    DEFAULT_MIN_RUN_TIME,
+    DEFAULT_MIN_IDLE_TIME,
+    DEFAULT_WINDOW_THRESHOLD,
+    DEFAULT_WINDOW_PAUSE,
+    ENTITY_AVAILABLE_TIMEOUT,
 )
+from .predictive import async_remove_model
+from .schedule import async_remove_schedule
+from .services import async_setup_services
 
 from homeassistant.components.climate.const import HVACAction, HVACMode
 
@@ -25,19 +60,46 @@ from homeassistant.components.climate.const import HVACAction, HVACMode
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[Platform] = [Platform.CLIMATE, Platform.SENSOR, Platform.SWITCH]
 
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+
+async def async_setup(hass: HomeAssistant, config: ConfigType) -> bool:
+    """Set up the Climate Wrapper services."""
+    async_setup_services(hass)
+    return True
+
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up Climate Wrapper from a config entry."""
 
+    started = hass.loop.time()
+
     # Initialize the shared Data
+    data = async_init_entry_data(hass, entry)
+    entry.async_on_unload(entry.add_update_listener(_async_update_options))
+
+    # Wait for the wrapped entities in the background, so the config entry
+    # is not held in setup while they come up
+    entry.async_create_background_task(
+        hass,
+        _async_start_logic(hass, entry, started),
+        f"{DOMAIN} start {entry.entry_id}",
+    )
+
+    # Init Components, unavailable until the Logic is running
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    data["timings"]["setup_platforms"] = hass.loop.time() - started
+    data["platforms_ready"].set()
+
+    return True
+
+
+@callback
+def async_init_entry_data(hass: HomeAssistant, entry: ConfigEntry) -> dict[str, Any]:
+    """Initialize the data shared between the Logic and the entities of entry."""
     hass.data.setdefault(DOMAIN, {})
-    hass.data[DOMAIN][entry.entry_id] = {
-        "conf": {
-            "friendly_name": entry.data[CONF_FRIENDLY_NAME],
-            "wrapped_climate_id": entry.data[CONF_WRAPPED_CLIMATE],
-            "temperature_sensor_id": entry.data[CONF_TEMPERATURE_SENSOR],
-            "temperature_variance": entry.data[CONF_TEMPERATURE_VARIANCE],
-        },
+    data = hass.data[DOMAIN][entry.entry_id] = {
+        "conf": entry_conf(entry),
         "state": IntegrationState(
             enable=True,
             hvac_action=HVACAction.IDLE,
@@ -49,47 +111,99 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         "climate": None,
         "sensor": None,
         "switch": None,
+        "platforms_ready": asyncio.Event(),
         "callbacks": [],
+        "timings": {},
     }
+    return data
 
-    # Check for availability of entities
-    wrapped_climate_id = entry.data[CONF_WRAPPED_CLIMATE]
-    temperature_sensor_id = entry.data[CONF_TEMPERATURE_SENSOR]
-
-    async def entity_available(entity_id: str) -> bool:
-        """Wait until an entity is available."""
-
-        MAX_TIMEOUT = 360
-        timeout = 0
-        while not hass.states.get(entity_id):
-            timeout += 1
-            if timeout >= MAX_TIMEOUT:
-                _LOGGER.error(f"Entity {entity_id} not available. Setup failed.")
-                return False
-            await asyncio.sleep(0.5)
-        return True
-
-    # Check if all entities are available
-    result = await asyncio.gather(
-        entity_available(wrapped_climate_id), entity_available(temperature_sensor_id)
+
+def entry_conf(entry: ConfigEntry) -> dict[str, Any]:
+    """Return the configuration of entry, the options taking precedence."""
+    # The options flow stores a complete configuration
+    config = entry.options or entry.data
+    return {
+        "friendly_name": config[CONF_FRIENDLY_NAME],
+        "wrapped_climate_ids": config[CONF_WRAPPED_CLIMATE],
+        "temperature_sensor_ids": config[CONF_TEMPERATURE_SENSOR],
+        "temperature_variance": config[CONF_TEMPERATURE_VARIANCE],
+        "update_debounce": config.get(CONF_UPDATE_DEBOUNCE, DEFAULT_UPDATE_DEBOUNCE),
+        "control_mode": config.get(CONF_CONTROL_MODE, CONTROL_MODE_HYSTERESIS),
+        "predictive_lookahead": config.get(
+            CONF_PREDICTIVE_LOOKAHEAD, DEFAULT_PREDICTIVE_LOOKAHEAD
+        ),
+        "sensor_filter": config.get(CONF_SENSOR_FILTER, FILTER_NONE),
+        "sensor_aggregation": config.get(CONF_SENSOR_AGGREGATION, AGGREGATION_MEAN),
+        "sensor_weights": config.get(CONF_SENSOR_WEIGHTS, []),
+        "filter_max_rate": config.get(CONF_FILTER_MAX_RATE, DEFAULT_FILTER_MAX_RATE),
+        "filter_threshold": config.get(CONF_FILTER_THRESHOLD, DEFAULT_FILTER_THRESHOLD),
+        "min_run_time": config.get(CONF_MIN_RUN_TIME, DEFAULT_MIN_RUN_TIME),
+        "min_idle_time": config.get(CONF_MIN_IDLE_TIME, DEFAULT_MIN_IDLE_TIME),
+        "window_threshold": config.get(CONF_WINDOW_THRESHOLD, DEFAULT_WINDOW_THRESHOLD),
+        "window_pause": config.get(CONF_WINDOW_PAUSE, DEFAULT_WINDOW_PAUSE),
+        "window_sensor": config.get(CONF_WINDOW_SENSOR),
+    }
+
+
+async def _async_update_options(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Apply changed options in place, reloading only if the entities change."""
+    data = hass.data[DOMAIN][entry.entry_id]
+    conf = entry_conf(entry)
+    if data["logic"] is None or conf["friendly_name"] != data["conf"]["friendly_name"]:
+        await hass.config_entries.async_reload(entry.entry_id)
+        return
+
+    started = hass.loop.time()
+    await data["logic"].async_reconfigure(conf)
+    data["timings"]["reconfigure"] = hass.loop.time() - started
+    _LOGGER.debug(
+        "Reconfigured %s in %.1f ms", entry.title, data["timings"]["reconfigure"] * 1e3
     )
-    if not all(result):
-        return False
 
-    # Init Logic
-    hass.data[DOMAIN][entry.entry_id]["logic"] = Logic(hass, entry)
 
-    # Init Components
-    for component in PLATFORMS:
-        hass.async_create_task(
-            hass.config_entries.async_forward_entry_setup(entry, component)
-        )
+async def _async_start_logic(
+    hass: HomeAssistant, entry: ConfigEntry, started: float
+) -> None:
+    """Start the Logic once the wrapped and the own entities are there.
 
-    return True
+    The timings of each phase are recorded in seconds since started.
+    """
+    data = hass.data[DOMAIN][entry.entry_id]
+
+    # Check for availability of entities, starting without the missing ones
+    # after a while
+    missing = await async_get_coordinator(hass).async_wait_available(
+        [*data["conf"]["wrapped_climate_ids"], *data["conf"]["temperature_sensor_ids"]],
+        ENTITY_AVAILABLE_TIMEOUT,
+    )
+    data["timings"]["wait_for_entities"] = hass.loop.time() - started
+
+    # The Logic writes the entities' state, they must be added by now
+    await data["platforms_ready"].wait()
+    data["timings"]["wait_for_platforms"] = hass.loop.time() - started
+
+    # Init Logic
+    logic = Logic(hass, entry)
+    await logic.async_setup()
+    if missing:
+        logic.async_entities_missing(missing)
+    data["logic"] = logic
+    data["timings"]["start_logic"] = hass.loop.time() - started
+
+    # Entities become available
+    for platform in ("climate", "sensor", "switch"):
+        data[platform].async_schedule_write()
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
+    # Retrieve and cancel the list of callbacks, stopping the Logic and its
+    # queued commands before the entities go away
+    callback_list = hass.data[DOMAIN][entry.entry_id].get("callbacks", [])
+    for cancel_callback in callback_list:
+        if callable(cancel_callback):
+            cancel_callback()
+
     unload_ok = all(
         await asyncio.gather(
             *[
@@ -99,19 +213,44 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
     )
 
-    # Retrieve and cancel the list of callbacks
-    callback_list = hass.data[DOMAIN][entry.entry_id].get("callbacks", [])
-    for cancel_callback in callback_list:
-        if callable(cancel_callback):
-            cancel_callback()
-
     # Clean up the data
     if unload_ok:
         hass.data[DOMAIN].pop(entry.entry_id)
 
+    # Last entry gone -> Release the shared coordinator
+    if not hass.data[DOMAIN] and DATA_COORDINATOR in hass.data:
+        hass.data.pop(DATA_COORDINATOR).async_shutdown()
+
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the persisted data of a config entry."""
+    await async_remove_model(hass, entry.entry_id)
+    await async_remove_log(hass, entry.entry_id)
+    await async_remove_schedule(hass, entry.entry_id)
+
+
+async def async_migrate_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
+    """Migrate an old config entry."""
+    if entry.version == 1:
+        # Version 2 wraps lists of climates and sensors
+        def listify(config: Mapping[str, Any]) -> dict[str, Any]:
+            config = dict(config)
+            for key in (CONF_WRAPPED_CLIMATE, CONF_TEMPERATURE_SENSOR):
+                if isinstance(config.get(key), str):
+                    config[key] = [config[key]]
+            return config
+
+        entry.version = 2
+        hass.config_entries.async_update_entry(
+            entry, data=listify(entry.data), options=listify(entry.options)
+        )
+        _LOGGER.info("Migrated config entry %s to version 2", entry.title)
+
+    return True
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
     """Reload config entry."""
     await async_unload_entry(hass, entry)
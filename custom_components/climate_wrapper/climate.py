@@ -5,16 +5,20 @@ from homeassistant.components.climate import (
     HVACMode,
 )
 from homeassistant.components.climate.const import (
+    ATTR_HVAC_ACTION,
     ClimateEntityFeature,
+    HVACAction,
     HVACMode,
 )
 from homeassistant.helpers.event import async_track_state_change_event
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 import logging
 
+from .entity import BatchedWriteEntity
 from .state import IntegrationState
 from .const import DOMAIN
 
@@ -30,7 +34,7 @@ async def async_setup_entry(
     async_add_entities([ClimateWrapperEntity(hass, config_entry.entry_id)], True)
 
 
-class ClimateWrapperEntity(ClimateEntity):
+class ClimateWrapperEntity(BatchedWriteEntity, ClimateEntity, RestoreEntity):
     """Representation of a Climate Wrapper entity."""
 
     def __init__(self, hass: HomeAssistant, entry_id: str):
@@ -48,6 +52,23 @@ class ClimateWrapperEntity(ClimateEntity):
         self._attr_supported_features = ClimateEntityFeature.TARGET_TEMPERATURE
         self._attr_hvac_modes = [HVACMode.OFF, HVACMode.AUTO, HVACMode.HEAT]
 
+    async def async_added_to_hass(self):
+        """Restore the mode, target and action from before the restart."""
+        await super().async_added_to_hass()
+        if (last_state := await self.async_get_last_state()) is None:
+            return
+
+        if last_state.state in self._attr_hvac_modes:
+            self._state.hvac_mode = HVACMode(last_state.state)
+        if (target := last_state.attributes.get(ATTR_TEMPERATURE)) is not None:
+            self._state.target_temperature = float(target)
+        if (action := last_state.attributes.get(ATTR_HVAC_ACTION)) in list(HVACAction):
+            self._state.hvac_action = HVACAction(action)
+
+        # Re-evaluate if the Logic already ran on the defaults
+        if self._data["logic"] is not None:
+            self._data["logic"].scheduler.async_schedule()
+
     @property
     def name(self):
         """Return the name of the entity."""
@@ -62,6 +83,11 @@ class ClimateWrapperEntity(ClimateEntity):
     def should_poll(self):
         return False
 
+    @property
+    def available(self):
+        """Return True once the Logic is running."""
+        return self._data["logic"] is not None
+
     @property
     def hvac_action(self):
         """Return the current HVAC action."""
@@ -77,6 +103,17 @@ class ClimateWrapperEntity(ClimateEntity):
         """Return the list of available HVAC modes."""
         return self._attr_hvac_modes
 
+    @property
+    def extra_state_attributes(self):
+        """Return diagnostic attributes of the control loop."""
+        if (logic := self._data["logic"]) is None:
+            return None
+        return {
+            "deferred_transitions": logic.deferred_transitions,
+            "next_schedule_transition": logic.schedule.next_transition,
+            "window_open": logic.window.open,
+        }
+
     @property
     def current_temperature(self):
         """Return the current temperature."""
@@ -92,11 +129,11 @@ class ClimateWrapperEntity(ClimateEntity):
         target_temp = kwargs.get(ATTR_TEMPERATURE)
         if target_temp is not None:
             self._state.target_temperature = target_temp
-            await self._data["logic"].update()
+            await self._data["logic"].async_refresh()
         else:
             _LOGGER.error("No target temperature provided")
 
     async def async_set_hvac_mode(self, hvac_mode: HVACMode):
         """Set new target HVAC mode."""
         self._state.hvac_mode = hvac_mode
-        await self._data["logic"].update()
+        await self._data["logic"].async_refresh()
@@ -0,0 +1,178 @@
+"""Idempotent command layer for the wrapped climate entity."""
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.core import CALLBACK_TYPE, callback
+from homeassistant.components.climate.const import (
+    HVACMode,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+)
+import logging
+
+from .coordinator import ClimateWrapperCoordinator
+from .pipeline import CommandPipeline
+from .state import ClimateState
+from .trace import trace_command
+from .const import COMMAND_ACK_TIMEOUT, TEMPERATURE_DIFF_TOLERANCE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingCommand:
+    """A command sent to the device and not yet confirmed."""
+
+    value: Any
+    cancel_expiry: CALLBACK_TYPE
+
+
+class ClimateCommander:
+    """Send commands to a wrapped climate, dropping duplicates of pending ones.
+
+    A command stays pending until the device reports the commanded value or
+    COMMAND_ACK_TIMEOUT seconds have passed, whichever comes first; the
+    expiry is a coordinator deadline, so it happens without further traffic.
+    Commands are queued on the entry's pipeline, which sends them.
+    """
+
+    def __init__(
+        self,
+        coordinator: ClimateWrapperCoordinator,
+        entity_id: str,
+        pipeline: CommandPipeline,
+        ack_timeout: float = COMMAND_ACK_TIMEOUT,
+    ) -> None:
+        """Initialize the commander."""
+        self._coordinator = coordinator
+        self.entity_id = entity_id
+        self._pipeline = pipeline
+        self._ack_timeout = ack_timeout
+        self._pending: dict[str, PendingCommand] = {}
+        self._settled = asyncio.Event()
+        self._settled.set()
+        self.last_temperature: float | None = None
+
+        # Statistics
+        self.calls: Counter[str] = Counter()
+        self.sent = 0
+        self.suppressed = 0
+        self.acknowledged = 0
+        self.expired = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the command counters."""
+        return {
+            "sent": self.sent,
+            "suppressed": self.suppressed,
+            "acknowledged": self.acknowledged,
+            "expired": self.expired,
+            "pending": len(self._pending),
+        }
+
+    @callback
+    def async_observe(self, wrapped_climate: ClimateState) -> None:
+        """Reconcile pending commands with the state reported by the device."""
+        pending = self._pending.get(SERVICE_SET_HVAC_MODE)
+        if pending is not None and wrapped_climate.hvac_mode == pending.value:
+            self._acknowledge(SERVICE_SET_HVAC_MODE)
+
+        pending = self._pending.get(SERVICE_SET_TEMPERATURE)
+        if (
+            pending is not None
+            and abs(wrapped_climate.target_temperature - pending.value)
+            <= TEMPERATURE_DIFF_TOLERANCE
+        ):
+            self._acknowledge(SERVICE_SET_TEMPERATURE)
+
+    async def async_wait_acknowledged(self) -> None:
+        """Wait until the device confirmed all pending commands."""
+        await self._settled.wait()
+
+    @callback
+    def async_set_hvac_mode(self, hvac_mode: HVACMode) -> bool:
+        """Set the HVAC mode unless the same mode is already pending."""
+        pending = self._pending.get(SERVICE_SET_HVAC_MODE)
+        if pending is not None and pending.value == hvac_mode:
+            self.suppressed += 1
+            return False
+
+        self._async_call(SERVICE_SET_HVAC_MODE, "hvac_mode", hvac_mode)
+        return True
+
+    @callback
+    def async_set_temperature(
+        self,
+        temperature: float,
+        min_temp: float | None = None,
+        max_temp: float | None = None,
+    ) -> bool:
+        """Set the target temperature unless an equivalent one is pending.
+
+        A pending target within [min_temp, max_temp] counts as equivalent.
+        """
+        pending = self._pending.get(SERVICE_SET_TEMPERATURE)
+        if pending is not None:
+            if min_temp is None or max_temp is None:
+                equivalent = pending.value == temperature
+            else:
+                equivalent = min_temp <= pending.value <= max_temp
+            if equivalent:
+                self.suppressed += 1
+                return False
+
+        self.last_temperature = temperature
+        self._async_call(SERVICE_SET_TEMPERATURE, "temperature", temperature)
+        return True
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Forget the pending commands."""
+        for pending in self._pending.values():
+            pending.cancel_expiry()
+        self._pending.clear()
+        self._settled.set()
+
+    def _acknowledge(self, service: str) -> None:
+        self._pending.pop(service).cancel_expiry()
+        self.acknowledged += 1
+        if not self._pending:
+            self._settled.set()
+
+    @callback
+    def _async_expire(self, service: str) -> None:
+        trace_command(
+            "Command %s on %s not confirmed in time, reconciling",
+            service,
+            self.entity_id,
+        )
+        del self._pending[service]
+        self.expired += 1
+        if not self._pending:
+            self._settled.set()
+
+    @callback
+    def _async_call(self, service: str, key: str, value: Any) -> None:
+        if (pending := self._pending.get(service)) is not None:
+            pending.cancel_expiry()
+        self._pending[service] = PendingCommand(
+            value,
+            self._coordinator.async_schedule_deadline(
+                self._ack_timeout, lambda: self._async_expire(service)
+            ),
+        )
+        self._settled.clear()
+        self.sent += 1
+        self.calls[service] += 1
+        self._pipeline.async_submit(
+            service,
+            {
+                "entity_id": self.entity_id,
+                key: value,
+            },
+        )
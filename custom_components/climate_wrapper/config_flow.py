@@ -5,6 +5,7 @@ import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.const import CONF_FRIENDLY_NAME
+from homeassistant.components.binary_sensor import DOMAIN as BINARY_SENSOR_DOMAIN
 from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
 from homeassistant.components.climate import DOMAIN as CLIMATE_DOMAIN
 from homeassistant.helpers import selector
@@ -15,13 +16,97 @@ from .const import (
     CONF_WRAPPED_CLIMATE,
     CONF_TEMPERATURE_SENSOR,
     CONF_TEMPERATURE_VARIANCE,
+    CONF_UPDATE_DEBOUNCE,
+    CONF_CONTROL_MODE,
+    CONF_PREDICTIVE_LOOKAHEAD,
+    CONTROL_MODE_HYSTERESIS,
+    CONTROL_MODE_PREDICTIVE,
+    CONF_SENSOR_FILTER,
+    CONF_SENSOR_AGGREGATION,
+    CONF_SENSOR_WEIGHTS,
+    CONF_FILTER_MAX_RATE,
+    CONF_FILTER_THRESHOLD,
+    CONF_MIN_RUN_TIME,
+    CONF_MIN_IDLE_TIME,
+    CONF_WINDOW_THRESHOLD,
+    CONF_WINDOW_PAUSE,
+    CONF_WINDOW_SENSOR,
+    FILTER_NONE,
+    FILTER_EMA,
+    FILTER_MEDIAN,
+    AGGREGATION_MEAN,
+    AGGREGATION_MIN,
+    AGGREGATION_WEIGHTED,
+    DEFAULT_UPDATE_DEBOUNCE,
+    DEFAULT_PREDICTIVE_LOOKAHEAD,
+    DEFAULT_FILTER_MAX_RATE,
+    DEFAULT_FILTER_THRESHOLD,
+    DEFAULT_MIN_RUN_TIME,
+    DEFAULT_MIN_IDLE_TIME,
+    DEFAULT_WINDOW_THRESHOLD,
+    DEFAULT_WINDOW_PAUSE,
 )
 
+CONTROL_MODE_SELECTOR = selector.selector(
+    {
+        "select": {
+            "options": [CONTROL_MODE_HYSTERESIS, CONTROL_MODE_PREDICTIVE],
+            "translation_key": CONF_CONTROL_MODE,
+        }
+    }
+)
+SENSOR_FILTER_SELECTOR = selector.selector(
+    {
+        "select": {
+            "options": [FILTER_NONE, FILTER_EMA, FILTER_MEDIAN],
+            "translation_key": CONF_SENSOR_FILTER,
+        }
+    }
+)
+SENSOR_AGGREGATION_SELECTOR = selector.selector(
+    {
+        "select": {
+            "options": [AGGREGATION_MEAN, AGGREGATION_MIN, AGGREGATION_WEIGHTED],
+            "translation_key": CONF_SENSOR_AGGREGATION,
+        }
+    }
+)
+WRAPPED_CLIMATE_SELECTOR = selector.selector(
+    {"entity": {"domain": CLIMATE_DOMAIN, "multiple": True}}
+)
+TEMPERATURE_SENSOR_SELECTOR = selector.selector(
+    {
+        "entity": {
+            "domain": SENSOR_DOMAIN,
+            "device_class": "temperature",
+            "multiple": True,
+        }
+    }
+)
+
+WINDOW_SENSOR_SELECTOR = selector.selector({"entity": {"domain": BINARY_SENSOR_DOMAIN}})
+
+
+def _parse_weights(user_input: dict, errors: dict) -> None:
+    """Turn the comma-separated sensor weights into one float per sensor."""
+    text = user_input.get(CONF_SENSOR_WEIGHTS, "").strip()
+    if not text:
+        user_input[CONF_SENSOR_WEIGHTS] = []
+        return
+    try:
+        weights = [float(weight) for weight in text.split(",")]
+    except ValueError:
+        weights = None
+    if weights is None or len(weights) != len(user_input[CONF_TEMPERATURE_SENSOR]):
+        errors[CONF_SENSOR_WEIGHTS] = "invalid_weights"
+        return
+    user_input[CONF_SENSOR_WEIGHTS] = weights
+
 
 class ClimateWrapperConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     """Handle a config flow for Climate Wrapper."""
 
-    VERSION = 1
+    VERSION = 2
 
     @staticmethod
     @callback
@@ -33,19 +118,52 @@ class ClimateWrapperConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors = {}
         if user_input is not None:
             # Validate user input and proceed with setup
-            return self.async_create_entry(title="Climate Wrapper", data=user_input)
+            _parse_weights(user_input, errors)
+            if not errors:
+                return self.async_create_entry(title="Climate Wrapper", data=user_input)
 
         # Input schema for the user configuration
         data_schema = vol.Schema(
             {
                 vol.Required(CONF_FRIENDLY_NAME): str,
-                vol.Required(CONF_WRAPPED_CLIMATE): selector.selector(
-                    {"entity": {"domain": CLIMATE_DOMAIN}}
-                ),
-                vol.Required(CONF_TEMPERATURE_SENSOR): selector.selector(
-                    {"entity": {"domain": SENSOR_DOMAIN, "device_class": "temperature"}}
-                ),
+                vol.Required(CONF_WRAPPED_CLIMATE): WRAPPED_CLIMATE_SELECTOR,
+                vol.Required(CONF_TEMPERATURE_SENSOR): TEMPERATURE_SENSOR_SELECTOR,
+                vol.Optional(
+                    CONF_SENSOR_AGGREGATION, default=AGGREGATION_MEAN
+                ): SENSOR_AGGREGATION_SELECTOR,
+                vol.Optional(CONF_SENSOR_WEIGHTS, default=""): str,
                 vol.Required(CONF_TEMPERATURE_VARIANCE): float,
+                vol.Optional(
+                    CONF_UPDATE_DEBOUNCE, default=DEFAULT_UPDATE_DEBOUNCE
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_CONTROL_MODE, default=CONTROL_MODE_HYSTERESIS
+                ): CONTROL_MODE_SELECTOR,
+                vol.Optional(
+                    CONF_PREDICTIVE_LOOKAHEAD, default=DEFAULT_PREDICTIVE_LOOKAHEAD
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_SENSOR_FILTER, default=FILTER_NONE
+                ): SENSOR_FILTER_SELECTOR,
+                vol.Optional(
+                    CONF_FILTER_MAX_RATE, default=DEFAULT_FILTER_MAX_RATE
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_FILTER_THRESHOLD, default=DEFAULT_FILTER_THRESHOLD
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_MIN_RUN_TIME, default=DEFAULT_MIN_RUN_TIME
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_MIN_IDLE_TIME, default=DEFAULT_MIN_IDLE_TIME
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_WINDOW_THRESHOLD, default=DEFAULT_WINDOW_THRESHOLD
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_WINDOW_PAUSE, default=DEFAULT_WINDOW_PAUSE
+                ): vol.Coerce(float),
+                vol.Optional(CONF_WINDOW_SENSOR): WINDOW_SENSOR_SELECTOR,
             }
         )
 
@@ -67,16 +185,53 @@ class ClimateWrapperOptionsFlowHandler(config_entries.OptionsFlow):
 
         if user_input is not None:
             # Update the configuration entry
-            return self.async_create_entry(title="", data=user_input)
+            _parse_weights(user_input, errors)
+            if not errors:
+                return self.async_create_entry(title="", data=user_input)
 
         # Prepare the default values for the form
         current_config = self.config_entry.options or self.config_entry.data
         default_name = current_config.get(CONF_FRIENDLY_NAME, "")
-        default_wrapped_climate = current_config.get(CONF_WRAPPED_CLIMATE, "")
-        default_temperature_sensor = current_config.get(CONF_TEMPERATURE_SENSOR, "")
+        default_wrapped_climate = current_config.get(CONF_WRAPPED_CLIMATE, [])
+        default_temperature_sensor = current_config.get(CONF_TEMPERATURE_SENSOR, [])
+        default_sensor_aggregation = current_config.get(
+            CONF_SENSOR_AGGREGATION, AGGREGATION_MEAN
+        )
+        default_sensor_weights = ", ".join(
+            f"{weight:g}" for weight in current_config.get(CONF_SENSOR_WEIGHTS, [])
+        )
         default_temperature_variance = current_config.get(
             CONF_TEMPERATURE_VARIANCE, 0.0
         )
+        default_update_debounce = current_config.get(
+            CONF_UPDATE_DEBOUNCE, DEFAULT_UPDATE_DEBOUNCE
+        )
+        default_control_mode = current_config.get(
+            CONF_CONTROL_MODE, CONTROL_MODE_HYSTERESIS
+        )
+        default_predictive_lookahead = current_config.get(
+            CONF_PREDICTIVE_LOOKAHEAD, DEFAULT_PREDICTIVE_LOOKAHEAD
+        )
+        default_sensor_filter = current_config.get(CONF_SENSOR_FILTER, FILTER_NONE)
+        default_filter_max_rate = current_config.get(
+            CONF_FILTER_MAX_RATE, DEFAULT_FILTER_MAX_RATE
+        )
+        default_filter_threshold = current_config.get(
+            CONF_FILTER_THRESHOLD, DEFAULT_FILTER_THRESHOLD
+        )
+        default_min_run_time = current_config.get(
+            CONF_MIN_RUN_TIME, DEFAULT_MIN_RUN_TIME
+        )
+        default_min_idle_time = current_config.get(
+            CONF_MIN_IDLE_TIME, DEFAULT_MIN_IDLE_TIME
+        )
+        default_window_threshold = current_config.get(
+            CONF_WINDOW_THRESHOLD, DEFAULT_WINDOW_THRESHOLD
+        )
+        default_window_pause = current_config.get(
+            CONF_WINDOW_PAUSE, DEFAULT_WINDOW_PAUSE
+        )
+        default_window_sensor = current_config.get(CONF_WINDOW_SENSOR)
 
         # Input schema for the user configuration
         data_schema = vol.Schema(
@@ -84,15 +239,52 @@ class ClimateWrapperOptionsFlowHandler(config_entries.OptionsFlow):
                 vol.Required(CONF_FRIENDLY_NAME, default=default_name): str,
                 vol.Required(
                     CONF_WRAPPED_CLIMATE, default=default_wrapped_climate
-                ): selector.selector({"entity": {"domain": CLIMATE_DOMAIN}}),
+                ): WRAPPED_CLIMATE_SELECTOR,
                 vol.Required(
                     CONF_TEMPERATURE_SENSOR, default=default_temperature_sensor
-                ): selector.selector(
-                    {"entity": {"domain": SENSOR_DOMAIN, "device_class": "temperature"}}
-                ),
+                ): TEMPERATURE_SENSOR_SELECTOR,
+                vol.Optional(
+                    CONF_SENSOR_AGGREGATION, default=default_sensor_aggregation
+                ): SENSOR_AGGREGATION_SELECTOR,
+                vol.Optional(CONF_SENSOR_WEIGHTS, default=default_sensor_weights): str,
                 vol.Required(
                     CONF_TEMPERATURE_VARIANCE, default=default_temperature_variance
                 ): float,
+                vol.Optional(
+                    CONF_UPDATE_DEBOUNCE, default=default_update_debounce
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_CONTROL_MODE, default=default_control_mode
+                ): CONTROL_MODE_SELECTOR,
+                vol.Optional(
+                    CONF_PREDICTIVE_LOOKAHEAD, default=default_predictive_lookahead
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_SENSOR_FILTER, default=default_sensor_filter
+                ): SENSOR_FILTER_SELECTOR,
+                vol.Optional(
+                    CONF_FILTER_MAX_RATE, default=default_filter_max_rate
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_FILTER_THRESHOLD, default=default_filter_threshold
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_MIN_RUN_TIME, default=default_min_run_time
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_MIN_IDLE_TIME, default=default_min_idle_time
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_WINDOW_THRESHOLD, default=default_window_threshold
+                ): vol.Coerce(float),
+                vol.Optional(
+                    CONF_WINDOW_PAUSE, default=default_window_pause
+                ): vol.Coerce(float),
+                # A suggested value, so the sensor can be cleared again
+                vol.Optional(
+                    CONF_WINDOW_SENSOR,
+                    description={"suggested_value": default_window_sensor},
+                ): WINDOW_SENSOR_SELECTOR,
             }
         )
 
@@ -1,16 +1,88 @@
 """Constants for climate_wrapper."""
+from datetime import timedelta
 from logging import Logger, getLogger
 
 LOGGER: Logger = getLogger(__package__)
 
 NAME = "Climate Wrapper"
 DOMAIN = "climate_wrapper"
+DATA_COORDINATOR = f"{DOMAIN}_coordinator"
 VERSION = "0.1.1"
 
 SAFETY_CHECK_TIMEOUT = 10
+EXTERNAL_CHANGE_PULSE = 1  # s
+EXTERNAL_CHANGE_HISTORY = 10  # changes
+NOTIFICATION_MIN_INTERVAL = 900  # s, per entry and issue
+ENTITY_AVAILABLE_TIMEOUT = 180
+COMMAND_ACK_TIMEOUT = 120
+COMMAND_QUEUE_SIZE = 64  # intents, per entry
+COMMAND_CALL_TIMEOUT = 10  # s, per service call
+SET_MANY_CONCURRENCY = 8  # entries refreshed at once
+SET_MANY_TIMEOUT = 30  # s, for the valves to confirm
+DEADLINE_BATCH_WINDOW = timedelta(seconds=5)
 TEMPERATURE_DIFF = 1.0
 TEMPERATURE_DIFF_TOLERANCE = 0.25
+DEFAULT_UPDATE_DEBOUNCE = 2.0
+DEFAULT_PREDICTIVE_LOOKAHEAD = 10.0
+
+PREDICTIVE_DEFAULT_RATE = 0.05  # °C/min
+PREDICTIVE_LEARNING_RATE = 0.1
+PREDICTIVE_MAX_RATE = 1.0  # °C/min
+PREDICTIVE_MAX_SAMPLE_GAP = 60  # min
+PREDICTIVE_FIT_PERIOD = 1200  # s of samples a rate is fitted over
+PREDICTIVE_MIN_SAMPLES = 3
+PREDICTIVE_MIN_BAND = 0.5  # share of the band kept between the switch points
+PREDICTIVE_SAVE_DELAY = 300  # s
+
+FILTER_NONE = "none"
+FILTER_EMA = "ema"
+FILTER_MEDIAN = "median"
+FILTER_EMA_ALPHA = 0.3
+FILTER_MEDIAN_SIZE = 5
+FILTER_OUTLIER_MAX_REJECTS = 3
+
+AGGREGATION_MEAN = "mean"
+AGGREGATION_MIN = "min"
+AGGREGATION_WEIGHTED = "weighted"
+DEFAULT_FILTER_MAX_RATE = 0.0  # °C/min, 0 = off
+DEFAULT_FILTER_THRESHOLD = 0.0  # °C
+DEFAULT_MIN_RUN_TIME = 0.0  # min
+DEFAULT_MIN_IDLE_TIME = 0.0  # min
+DEFAULT_WINDOW_THRESHOLD = 0.0  # °C/min, 0 = off
+DEFAULT_WINDOW_PAUSE = 30.0  # min
+
+WINDOW_SLOPE_PERIOD = 600  # s
+WINDOW_MIN_SAMPLES = 3
+
+DECISION_LOG_FLUSH_INTERVAL = 60  # s
+DECISION_LOG_MAX_BUFFERED = 256  # records
+DECISION_LOG_MAX_SIZE = 1024 * 1024  # bytes, per generation
+DECISION_LOG_QUERY_LIMIT = 5000  # records
+
+WARM_START_PERIOD = timedelta(hours=1)
+WARM_START_MAX_SAMPLES = 50
+
+SERVICE_GET_DECISIONS = "get_decisions"
+SERVICE_SET_TRACE_SAMPLING = "set_trace_sampling"
+SERVICE_SET_SCHEDULE = "set_schedule"
+SERVICE_SET_MANY = "set_many"
+
+CONTROL_MODE_HYSTERESIS = "hysteresis"
+CONTROL_MODE_PREDICTIVE = "predictive"
 
 CONF_WRAPPED_CLIMATE = "wrapped_climate"
 CONF_TEMPERATURE_SENSOR = "temperature_sensor"
 CONF_TEMPERATURE_VARIANCE = "temperature_variance"
+CONF_UPDATE_DEBOUNCE = "update_debounce"
+CONF_CONTROL_MODE = "control_mode"
+CONF_PREDICTIVE_LOOKAHEAD = "predictive_lookahead"
+CONF_SENSOR_FILTER = "sensor_filter"
+CONF_SENSOR_AGGREGATION = "sensor_aggregation"
+CONF_SENSOR_WEIGHTS = "sensor_weights"
+CONF_FILTER_MAX_RATE = "filter_max_rate"
+CONF_FILTER_THRESHOLD = "filter_threshold"
+CONF_MIN_RUN_TIME = "min_run_time"
+CONF_MIN_IDLE_TIME = "min_idle_time"
+CONF_WINDOW_THRESHOLD = "window_threshold"
+CONF_WINDOW_PAUSE = "window_pause"
+CONF_WINDOW_SENSOR = "window_sensor"
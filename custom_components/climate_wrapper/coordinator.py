@@ -0,0 +1,246 @@
+"""Domain-wide coordinator shared by all Climate Wrapper entries."""
+from __future__ import annotations
+
+from collections.abc import Callable, Coroutine
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+import heapq
+from itertools import count
+import logging
+from typing import Any
+
+from homeassistant.const import EVENT_STATE_CHANGED
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    Event,
+    HassJob,
+    HomeAssistant,
+    callback,
+)
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.helpers.start import async_at_started
+import homeassistant.util.dt as dt_util
+
+from .const import DATA_COORDINATOR, DEADLINE_BATCH_WINDOW
+
+_LOGGER = logging.getLogger(__name__)
+
+EventAction = Callable[[Event], Coroutine[Any, Any, None] | None]
+
+
+@dataclass(order=True)
+class _Deadline:
+    when: datetime
+    seq: int
+    action: Callable[[], None] = field(compare=False)
+    cancelled: bool = field(default=False, compare=False)
+
+
+@callback
+def async_get_coordinator(hass: HomeAssistant) -> ClimateWrapperCoordinator:
+    """Return the shared coordinator, creating it on first use."""
+    if (coordinator := hass.data.get(DATA_COORDINATOR)) is None:
+        coordinator = hass.data[DATA_COORDINATOR] = ClimateWrapperCoordinator(hass)
+    return coordinator
+
+
+class ClimateWrapperCoordinator:
+    """Own the state-change subscription and timers of all entries.
+
+    A single state_changed listener serves every wrapped climate and sensor;
+    events are routed through an entity-id index. Deadlines of all entries
+    share one timer, and deadlines falling within DEADLINE_BATCH_WINDOW of
+    the earliest one are handled in the same tick, at the latest of them, so
+    no deadline fires early.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize the coordinator."""
+        self._hass = hass
+
+        # Entity-id index of state change listeners
+        self._index: dict[str, list[HassJob]] = {}
+        self._unsub_state_changed: CALLBACK_TYPE | None = None
+
+        # Min-heap of deadlines, served by a single timer
+        self._deadlines: list[_Deadline] = []
+        self._deadline_seq = count()
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._timer_at: datetime | None = None
+
+    #
+    # State Changes
+    #
+
+    @callback
+    def async_track_entity(self, entity_id: str, action: EventAction) -> CALLBACK_TYPE:
+        """Call action on every state change of entity_id."""
+        job = HassJob(action, f"climate_wrapper {entity_id}")
+        self._index.setdefault(entity_id, []).append(job)
+
+        if self._unsub_state_changed is None:
+            self._unsub_state_changed = self._hass.bus.async_listen(
+                EVENT_STATE_CHANGED,
+                self._async_dispatch,
+                event_filter=self._async_filter,
+                run_immediately=True,
+            )
+
+        @callback
+        def remove() -> None:
+            jobs = self._index.get(entity_id)
+            if jobs is None or job not in jobs:
+                return
+            jobs.remove(job)
+            if not jobs:
+                del self._index[entity_id]
+            if not self._index and self._unsub_state_changed is not None:
+                self._unsub_state_changed()
+                self._unsub_state_changed = None
+
+        return remove
+
+    async def async_wait_available(
+        self, entity_ids: list[str], timeout: float | timedelta
+    ) -> set[str]:
+        """Wait until every entity in entity_ids has a state.
+
+        Resolves on the state change that makes the last entity appear, with
+        a re-check once Home Assistant has started, or timeout after the
+        start. Return the entities still missing.
+        """
+        missing = {
+            entity_id
+            for entity_id in entity_ids
+            if self._hass.states.get(entity_id) is None
+        }
+        if not missing:
+            return missing
+
+        future = self._hass.loop.create_future()
+        unsubs: list[CALLBACK_TYPE] = []
+
+        @callback
+        def _async_check(*_: Any) -> None:
+            missing.difference_update(
+                [
+                    entity_id
+                    for entity_id in missing
+                    if self._hass.states.get(entity_id) is not None
+                ]
+            )
+            if not missing and not future.done():
+                future.set_result(None)
+
+        @callback
+        def _async_timeout() -> None:
+            if not future.done():
+                future.set_result(None)
+
+        @callback
+        def _async_started(_hass: HomeAssistant) -> None:
+            _async_check()
+            if not future.done():
+                unsubs.append(self.async_schedule_deadline(timeout, _async_timeout))
+
+        for entity_id in missing:
+            unsubs.append(self.async_track_entity(entity_id, _async_check))
+        unsubs.append(async_at_started(self._hass, _async_started))
+
+        try:
+            await future
+        finally:
+            for unsub in unsubs:
+                unsub()
+        return missing
+
+    @callback
+    def _async_filter(self, event: Event) -> bool:
+        return event.data["entity_id"] in self._index
+
+    @callback
+    def _async_dispatch(self, event: Event) -> None:
+        for job in self._index.get(event.data["entity_id"], ()):
+            self._hass.async_run_hass_job(job, event)
+
+    #
+    # Deadlines
+    #
+
+    @callback
+    def async_schedule_deadline(
+        self, delay: float | timedelta, action: Callable[[], None]
+    ) -> CALLBACK_TYPE:
+        """Call action once delay has passed. Return a cancel callback."""
+        if isinstance(delay, timedelta):
+            delay = delay.total_seconds()
+        deadline = _Deadline(
+            dt_util.utcnow() + timedelta(seconds=delay),
+            next(self._deadline_seq),
+            action,
+        )
+        heapq.heappush(self._deadlines, deadline)
+        self._async_arm_timer()
+
+        @callback
+        def cancel() -> None:
+            deadline.cancelled = True
+            self._async_arm_timer()
+
+        return cancel
+
+    @callback
+    def _async_arm_timer(self) -> None:
+        # Lazily drop cancelled deadlines from the top of the heap
+        while self._deadlines and self._deadlines[0].cancelled:
+            heapq.heappop(self._deadlines)
+
+        next_at = None
+        if self._deadlines:
+            batch_until = self._deadlines[0].when + DEADLINE_BATCH_WINDOW
+            next_at = max(
+                deadline.when
+                for deadline in self._deadlines
+                if not deadline.cancelled and deadline.when <= batch_until
+            )
+        if next_at == self._timer_at:
+            return
+
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._timer_at = next_at
+        if next_at is not None:
+            self._unsub_timer = async_track_point_in_utc_time(
+                self._hass, self._async_run_deadlines, next_at
+            )
+
+    @callback
+    def _async_run_deadlines(self, now: datetime) -> None:
+        self._unsub_timer = None
+        self._timer_at = None
+
+        due = []
+        while self._deadlines and self._deadlines[0].when <= now:
+            deadline = heapq.heappop(self._deadlines)
+            if not deadline.cancelled:
+                due.append(deadline)
+
+        for deadline in due:
+            deadline.cancelled = True
+            deadline.action()
+
+        self._async_arm_timer()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop all listeners and timers."""
+        if self._unsub_state_changed is not None:
+            self._unsub_state_changed()
+            self._unsub_state_changed = None
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        self._timer_at = None
+        self._index.clear()
+        self._deadlines.clear()
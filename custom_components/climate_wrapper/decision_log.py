@@ -0,0 +1,303 @@
+"""Append-only binary log of the control loop's decisions."""
+from __future__ import annotations
+
+import asyncio
+from bisect import bisect_left, bisect_right
+from contextlib import suppress
+from datetime import datetime
+from enum import IntEnum
+import logging
+import math
+import mmap
+import os
+import struct
+from typing import Any, NamedTuple
+
+from homeassistant.components.climate.const import HVACAction, HVACMode
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
+from homeassistant.core import CALLBACK_TYPE, Event, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+import homeassistant.util.dt as dt_util
+
+from .const import (
+    DECISION_LOG_FLUSH_INTERVAL,
+    DECISION_LOG_MAX_BUFFERED,
+    DECISION_LOG_MAX_SIZE,
+    DOMAIN,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# Timestamp, temperature, target, command value, action, command, reason, pad
+RECORD = struct.Struct("<dfffBBBx")
+
+_ACTIONS = (HVACAction.OFF, HVACAction.IDLE, HVACAction.HEATING)
+_MODES = (HVACMode.OFF, HVACMode.HEAT, HVACMode.AUTO)
+_UNKNOWN = 0xFF
+
+
+class Command(IntEnum):
+    """Command sent to the wrapped climate."""
+
+    NONE = 0
+    SET_TEMPERATURE = 1
+    SET_HVAC_MODE = 2
+
+
+class Reason(IntEnum):
+    """Why the control loop chose its action."""
+
+    MODE_OFF = 0
+    MODE_HEAT = 1
+    WITHIN_BAND = 2
+    BELOW_MIN = 3
+    ABOVE_MAX = 4
+    PREDICTED_HEAT = 5
+    PREDICTED_IDLE = 6
+    HELD = 7
+    WINDOW_OPEN = 8
+    NO_TEMPERATURE = 9
+
+
+class Decision(NamedTuple):
+    """One decoded record."""
+
+    timestamp: float
+    temperature: float
+    target: float
+    command_value: float
+    action: int
+    command: int
+    reason: int
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the record with its codes resolved to names."""
+        command = Command(self.command)
+        if command is Command.SET_HVAC_MODE:
+            value = _decode(_MODES, int(self.command_value))
+        elif command is Command.SET_TEMPERATURE:
+            value = round(self.command_value, 2)
+        else:
+            value = None
+        return {
+            "time": dt_util.utc_from_timestamp(self.timestamp).isoformat(),
+            "temperature": (
+                None if math.isnan(self.temperature) else round(self.temperature, 2)
+            ),
+            "target": round(self.target, 2),
+            "hvac_action": _decode(_ACTIONS, self.action),
+            "command": command.name.lower(),
+            "command_value": value,
+            "reason": Reason(self.reason).name.lower(),
+        }
+
+
+class DecisionLog:
+    """Record every evaluation of an entry into a size-rotated binary file.
+
+    Records are packed into an in-memory buffer on the event loop and
+    appended to disk by the executor every DECISION_LOG_FLUSH_INTERVAL
+    seconds, or once DECISION_LOG_MAX_BUFFERED records are waiting. Once the
+    file exceeds DECISION_LOG_MAX_SIZE it is rotated to a single backup.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str) -> None:
+        """Initialize the log."""
+        self._hass = hass
+        self.path = log_path(hass, entry_id)
+        self._buffer = bytearray()
+        self._lock = asyncio.Lock()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+        self._unsub_stop = hass.bus.async_listen(
+            EVENT_HOMEASSISTANT_STOP, self._async_stop
+        )
+
+        # Statistics
+        self.records = 0
+        self.flushes = 0
+        self.rotations = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the log counters."""
+        return {
+            "records": self.records,
+            "buffered": len(self._buffer) // RECORD.size,
+            "flushes": self.flushes,
+            "rotations": self.rotations,
+        }
+
+    @callback
+    def async_record(
+        self,
+        temperature: float | None,
+        target: float,
+        action: HVACAction,
+        command: Command,
+        command_value: Any,
+        reason: Reason,
+    ) -> None:
+        """Buffer a record of the current decision."""
+        if command is Command.SET_HVAC_MODE:
+            command_value = _encode(_MODES, command_value)
+        self._buffer += RECORD.pack(
+            dt_util.utcnow().timestamp(),
+            float("nan") if temperature is None else temperature,
+            target,
+            command_value or 0.0,
+            _encode(_ACTIONS, action),
+            command,
+            reason,
+        )
+        self.records += 1
+
+        if len(self._buffer) >= DECISION_LOG_MAX_BUFFERED * RECORD.size:
+            self._async_start_flush()
+        elif self._unsub_flush is None:
+            self._unsub_flush = async_call_later(
+                self._hass, DECISION_LOG_FLUSH_INTERVAL, self._async_flush_timer
+            )
+
+    async def async_flush(self) -> None:
+        """Write the buffered records to disk."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+
+        # One write at a time keeps the records in order
+        async with self._lock:
+            if not self._buffer:
+                return
+            data, self._buffer = bytes(self._buffer), bytearray()
+            try:
+                rotated = await self._hass.async_add_executor_job(
+                    _append, self.path, data
+                )
+            except OSError as err:
+                _LOGGER.warning(
+                    "Couldn't write the decision log %s: %s", self.path, err
+                )
+                return
+            self.flushes += 1
+            self.rotations += rotated
+
+    async def async_query(
+        self, start: datetime, end: datetime, limit: int
+    ) -> list[Decision]:
+        """Return at most limit records between start and end, oldest first."""
+        await self.async_flush()
+        async with self._lock:
+            return await self._hass.async_add_executor_job(
+                _read, self.path, start.timestamp(), end.timestamp(), limit
+            )
+
+    @callback
+    def _async_start_flush(self) -> None:
+        self._hass.async_create_background_task(
+            self.async_flush(), f"{DOMAIN} flush {os.path.basename(self.path)}"
+        )
+
+    @callback
+    def _async_final_flush(self) -> None:
+        # A tracked task, so shutdown waits for it
+        self._hass.async_create_task(self.async_flush())
+
+    @callback
+    def _async_flush_timer(self, _now: datetime) -> None:
+        self._unsub_flush = None
+        self._async_start_flush()
+
+    @callback
+    def _async_stop(self, _event: Event) -> None:
+        self._async_final_flush()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Write the remaining records and stop listening."""
+        self._unsub_stop()
+        self._async_final_flush()
+
+
+def log_path(hass: HomeAssistant, entry_id: str) -> str:
+    """Return the path of the decision log of an entry."""
+    return hass.config.path(".storage", f"{DOMAIN}.{entry_id}.decisions")
+
+
+async def async_remove_log(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the decision log of an entry, including its backup."""
+    await hass.async_add_executor_job(_remove, log_path(hass, entry_id))
+
+
+def _encode(values: tuple[str, ...], value: str) -> int:
+    try:
+        return values.index(value)
+    except ValueError:
+        return _UNKNOWN
+
+
+def _decode(values: tuple[str, ...], code: int) -> str | None:
+    return str(values[code]) if code < len(values) else None
+
+
+#
+# Executor
+#
+
+
+def _append(path: str, data: bytes) -> bool:
+    """Append data to the log, rotating it first if it is full."""
+    rotated = False
+    try:
+        if os.path.getsize(path) + len(data) > DECISION_LOG_MAX_SIZE:
+            os.replace(path, f"{path}.1")
+            rotated = True
+    except FileNotFoundError:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    with open(path, "ab") as file:
+        file.write(data)
+    return rotated
+
+
+class _Timestamps:
+    """Sequence view of the record timestamps of a mapped log, for bisect."""
+
+    def __init__(self, buffer: mmap.mmap) -> None:
+        self._buffer = buffer
+        self._length = len(buffer) // RECORD.size
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> float:
+        return struct.unpack_from("<d", self._buffer, index * RECORD.size)[0]
+
+
+def _read(path: str, start: float, end: float, limit: int) -> list[Decision]:
+    """Return the records between start and end of the backup and the log."""
+    decisions: list[Decision] = []
+    for file_path in (f"{path}.1", path):
+        try:
+            file = open(file_path, "rb")
+        except FileNotFoundError:
+            continue
+        with file:
+            if os.fstat(file.fileno()).st_size < RECORD.size:
+                continue
+            with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+                timestamps = _Timestamps(buffer)
+                first = bisect_left(timestamps, start)
+                last = bisect_right(timestamps, end)
+                for index in range(first, min(last, first + limit - len(decisions))):
+                    decisions.append(
+                        Decision._make(RECORD.unpack_from(buffer, index * RECORD.size))
+                    )
+        if len(decisions) >= limit:
+            break
+    return decisions
+
+
+def _remove(path: str) -> None:
+    for file_path in (path, f"{path}.1"):
+        with suppress(FileNotFoundError):
+            os.remove(file_path)
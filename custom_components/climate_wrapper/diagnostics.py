@@ -0,0 +1,27 @@
+"""Diagnostics support for Climate Wrapper."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    data = hass.data[DOMAIN][entry.entry_id]
+
+    diagnostics = {
+        "conf": data["conf"],
+        "state": asdict(data["state"]),
+        "timings": data["timings"],
+    }
+    if (logic := data["logic"]) is not None:
+        diagnostics["control_loop"] = logic.diagnostics()
+
+    return diagnostics
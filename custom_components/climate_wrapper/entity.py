@@ -0,0 +1,59 @@
+"""Base entity for Climate Wrapper."""
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+
+
+class BatchedWriteEntity(Entity):
+    """Entity writing its state at most once per loop iteration.
+
+    async_schedule_write coalesces all requests of an iteration into one
+    write, which is skipped if the rendered state and attributes equal the
+    last written ones.
+    """
+
+    _write_pending = False
+    _last_written: tuple[Any, ...] | None = None
+    writes = 0
+    suppressed_writes = 0
+
+    @property
+    def write_stats(self) -> dict[str, int]:
+        """Return the state write counters."""
+        return {"writes": self.writes, "suppressed": self.suppressed_writes}
+
+    @callback
+    def async_schedule_write(self) -> None:
+        """Write the state once the current loop iteration is done."""
+        if self._write_pending:
+            self.suppressed_writes += 1
+            return
+        if self.hass is None:
+            # Not added yet, the state is written once it is
+            return
+        self._write_pending = True
+        self.hass.loop.call_soon(self._async_write_if_changed)
+
+    @callback
+    def _async_write_if_changed(self) -> None:
+        self._write_pending = False
+        rendered = self._rendered_state()
+        if rendered == self._last_written:
+            self.suppressed_writes += 1
+            return
+        self._last_written = rendered
+        self.writes += 1
+        self.async_write_ha_state()
+
+    def _rendered_state(self) -> tuple[Any, ...]:
+        """Return what a write would put into the state machine."""
+        if not (available := self.available):
+            return (self._stringify_state(available),)
+        return (
+            self._stringify_state(available),
+            self.state_attributes,
+            self.extra_state_attributes,
+        )
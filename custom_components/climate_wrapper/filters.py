@@ -0,0 +1,110 @@
+"""Streaming filters for temperature sensor samples."""
+from __future__ import annotations
+
+from collections import deque
+from datetime import datetime
+
+from .const import (
+    AGGREGATION_MIN,
+    AGGREGATION_WEIGHTED,
+    FILTER_EMA,
+    FILTER_EMA_ALPHA,
+    FILTER_MEDIAN,
+    FILTER_MEDIAN_SIZE,
+    FILTER_OUTLIER_MAX_REJECTS,
+)
+
+
+class SensorFilter:
+    """Filter a stream of temperature samples in bounded memory.
+
+    Samples first pass a rate-of-change outlier check against the last
+    accepted sample, then an optional smoothing stage: an exponential moving
+    average or the median of the last FILTER_MEDIAN_SIZE samples.
+    """
+
+    def __init__(self, mode: str, max_rate: float) -> None:
+        """Initialize the filter. A max_rate of 0 disables outlier rejection."""
+        self.mode = mode
+        self.max_rate = max_rate
+
+        self._last: tuple[datetime, float] | None = None
+        self._rejects = 0
+        self._ema: float | None = None
+        self._window: deque[float] = deque(maxlen=FILTER_MEDIAN_SIZE)
+
+        # Statistics
+        self.accepted = 0
+        self.rejected = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the filter counters."""
+        return {"accepted": self.accepted, "rejected": self.rejected}
+
+    def process(self, value: float, when: datetime) -> float | None:
+        """Return the filtered value, or None if the sample was rejected."""
+        if self._is_outlier(value, when):
+            self.rejected += 1
+            return None
+        self._last = (when, value)
+        self.accepted += 1
+
+        if self.mode == FILTER_EMA:
+            if self._ema is None:
+                self._ema = value
+            else:
+                self._ema += FILTER_EMA_ALPHA * (value - self._ema)
+            return self._ema
+
+        if self.mode == FILTER_MEDIAN:
+            self._window.append(value)
+            ordered = sorted(self._window)
+            middle = len(ordered) // 2
+            if len(ordered) % 2:
+                return ordered[middle]
+            return (ordered[middle - 1] + ordered[middle]) / 2
+
+        return value
+
+    def _is_outlier(self, value: float, when: datetime) -> bool:
+        if not self.max_rate or self._last is None:
+            return False
+
+        last_when, last_value = self._last
+        minutes = max((when - last_when).total_seconds() / 60, 1 / 60)
+        if abs(value - last_value) / minutes <= self.max_rate:
+            self._rejects = 0
+            return False
+
+        # A persistent jump is a real change, not an outlier
+        self._rejects += 1
+        if self._rejects > FILTER_OUTLIER_MAX_REJECTS:
+            self._rejects = 0
+            return False
+        return True
+
+
+def aggregate(
+    values: dict[str, float], mode: str, weights: dict[str, float] | None = None
+) -> float | None:
+    """Combine the temperatures of several sensors, keyed by entity id.
+
+    Returns None if no sensor has a value. Sensors without a weight count
+    with weight 1.
+    """
+    if not values:
+        return None
+    if mode == AGGREGATION_MIN:
+        return min(values.values())
+    if mode == AGGREGATION_WEIGHTED and weights:
+        total = sum(weights.get(entity_id, 1.0) for entity_id in values)
+        if total > 0:
+            return (
+                sum(
+                    value * weights.get(entity_id, 1.0)
+                    for entity_id, value in values.items()
+                )
+                / total
+            )
+    return sum(values.values()) / len(values)
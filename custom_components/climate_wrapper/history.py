@@ -0,0 +1,36 @@
+"""Bounded reads of recorder history, used to warm-start after a restart."""
+from __future__ import annotations
+
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant, State
+import homeassistant.util.dt as dt_util
+
+
+async def async_get_recent_states(
+    hass: HomeAssistant,
+    entity_id: str,
+    period: timedelta,
+    limit: int,
+    before: datetime | None = None,
+) -> list[State]:
+    """Return recorded states of entity_id within period before before, oldest first.
+
+    At most the newest limit states are read, so the cost is bounded
+    regardless of the size of the database.
+    """
+    if "recorder" not in hass.config.components:
+        return []
+    # Imported only once loaded, as the recorder's requirements are optional
+    from homeassistant.components.recorder import get_instance, history
+
+    end = before or dt_util.utcnow()
+    start = end - period
+    states = await get_instance(hass).async_add_executor_job(
+        history.get_last_state_changes, hass, limit, entity_id
+    )
+    return [
+        state
+        for state in states.get(entity_id.lower(), [])
+        if start <= state.last_updated < end
+    ]
@@ -1,34 +1,49 @@
 """Climate Wrapper Logic."""
 from __future__ import annotations
 
-from datetime import timedelta
-from homeassistant.core import HomeAssistant, Event, Context
-from homeassistant.config_entries import ConfigEntry
-from homeassistant.helpers.event import (
-    async_track_state_change_event,
-    async_track_time_interval,
+import asyncio
+from collections import Counter
+from datetime import datetime
+from typing import Any
+from homeassistant.core import (
+    CALLBACK_TYPE,
+    HomeAssistant,
+    Event,
+    Context,
+    State,
+    callback,
 )
+from homeassistant.config_entries import ConfigEntry
 from homeassistant.components.climate import HVACAction
-from homeassistant.components.persistent_notification import (
-    async_create as async_create_notification,
-    async_dismiss as async_dismiss_notification,
-)
 from homeassistant.components.climate.const import HVACMode
-from homeassistant.const import ATTR_TEMPERATURE
-from homeassistant.components.climate.const import (
-    SERVICE_SET_HVAC_MODE,
-    SERVICE_SET_TEMPERATURE,
-    DOMAIN as DOMAIN_CLIMATE,
-)
+import homeassistant.util.dt as dt_util
 import logging
 import math
-
+import time
+
+from .commands import ClimateCommander
+from .coordinator import async_get_coordinator
+from .decision_log import Command, DecisionLog, Reason
+from .filters import SensorFilter, aggregate
+from .history import async_get_recent_states
+from .metrics import ControlLoopMetrics
+from .notifications import Issue, NotificationManager
+from .pipeline import CommandPipeline
+from .predictive import PredictiveControl
+from .safety import SafetyChecker
+from .schedule import WeeklySchedule
+from .window import WindowDetector
+from .scheduler import UpdateScheduler
+from .trace import trace_climate, trace_control, trace_sensor
 from .state import IntegrationState, ClimateState
 from .const import (
     DOMAIN,
-    SAFETY_CHECK_TIMEOUT,
+    CONTROL_MODE_PREDICTIVE,
+    FILTER_NONE,
     TEMPERATURE_DIFF,
     TEMPERATURE_DIFF_TOLERANCE,
+    WARM_START_MAX_SAMPLES,
+    WARM_START_PERIOD,
 )
 
 _LOGGER = logging.getLogger(__name__)
@@ -40,46 +55,414 @@ class Logic:
         self._entry_id = entry.entry_id
         self._data = hass.data[DOMAIN][self._entry_id]
         self._state: IntegrationState = self._data["state"]
+        self.coordinator = async_get_coordinator(hass)
+
+        # Tracked entities, rebound when the options change
+        self._wrapped_climate_ids: list[str] = []
+        self._temperature_sensor_ids: list[str] = []
+        self._window_sensor_id: str | None = None
+        self._unsub_entities: dict[str, CALLBACK_TYPE] = {}
+        self._data["callbacks"].append(self._async_unbind_all)
 
-        # Save important entities
-        self._wrapped_climate_id = self._data["conf"]["wrapped_climate_id"]
-        self._wrapped_climate = ClimateState(hass, self._wrapped_climate_id)
-        self._temperature_sensor_id = self._data["conf"]["temperature_sensor_id"]
+        # One commander per valve, all sending through a single pipeline so
+        # decisions are never interleaved with service calls in flight
+        self.pipeline = CommandPipeline(hass, self._data["conf"]["friendly_name"])
+        self._data["callbacks"].append(self.pipeline.async_shutdown)
+        self.commanders: dict[str, ClimateCommander] = {}
 
         # Internal States
-        self._last_target_temperature = None
-        self._safety_check_timeout = 0
         self._offset = 1  # In °C
 
-        # Update Temperature
-        self._state.temperature = float(
-            self._hass.states.get(self._temperature_sensor_id).state
+        # Minimum run/idle time of an action in AUTO mode
+        self._last_action_change: datetime | None = None
+        self._unsub_cycle_timer = None
+        self.deferred_transitions = 0
+        self._data["callbacks"].append(self._async_cancel_cycle_timer)
+
+        # Optional predictive control with learned heat-up/cool-down rates
+        self.predictive: PredictiveControl | None = None
+
+        # Scheduled target temperatures, see schedule.py
+        self.schedule = WeeklySchedule(
+            hass, self._entry_id, self._async_apply_scheduled_target
+        )
+        self._data["callbacks"].append(self.schedule.async_shutdown)
+
+        # Instrumentation, see diagnostics.py
+        self.metrics = ControlLoopMetrics()
+
+        # Merge bursts of triggers into single evaluations
+        self.scheduler = UpdateScheduler(
+            hass, self.update, self._data["conf"]["update_debounce"]
         )
+        self._data["callbacks"].append(self.scheduler.async_shutdown)
+
+        # Streaming filter per sensor in front of the aggregation
+        self.sensor_filters: dict[str, SensorFilter] = {}
+        self._sensor_values: dict[str, float] = {}
+        self._sensor_weights: dict[str, float] = {}
+        self._evaluated_temperature = None
+
+        # Temperatures that cannot change the decision, see _async_update_dead_zone
+        self._dead_zone: tuple[float, float] | None = None
+        self._dead_zone_inputs: tuple[Any, ...] | None = None
+        self.fast_path_samples = 0
+
+        # Pause while a window is open, see window.py
+        self.window = WindowDetector(
+            self.coordinator,
+            self._data["conf"]["window_threshold"],
+            self._data["conf"]["window_pause"],
+            self.scheduler.async_schedule,
+        )
+        self._data["callbacks"].append(self.window.async_shutdown)
+
+        # Binary record of every decision, see decision_log.py
+        self.decision_log = DecisionLog(hass, self._entry_id)
+        self._data["callbacks"].append(self.decision_log.async_shutdown)
 
-        # Setup Climate Listener
-        self._data["callbacks"].append(
-            async_track_state_change_event(
-                hass, [self._wrapped_climate_id], self._wrapped_climate_state_change
+        # Notifications, sent on transitions only
+        self.notifications = NotificationManager(
+            hass, self._entry_id, self._data["conf"]["friendly_name"]
+        )
+        self._data["callbacks"].append(self.notifications.async_shutdown)
+
+        # Safety Check per valve, evaluated on every update instead of polled
+        self.safety: dict[str, SafetyChecker] = {}
+
+        conf = self._data["conf"]
+        self._async_bind_valves(conf["wrapped_climate_ids"])
+        self._async_bind_sensors(conf["temperature_sensor_ids"])
+        self._async_bind_window_sensor(conf["window_sensor"])
+
+    async def async_setup(self):
+        """Load persisted state and run the first evaluation."""
+        await self._async_setup_predictive()
+        await self.schedule.async_load()
+        if self._window_sensor_id is not None:
+            self.window.async_update_contact(
+                self._hass.states.get(self._window_sensor_id)
             )
+
+        # Update Temperature, with the filters warmed up on recent history
+        await self._async_seed_sensors(self._temperature_sensor_ids)
+        self._state.temperature = self._aggregate_temperature()
+        self._evaluated_temperature = self._state.temperature
+
+        # The wrapped climates' targets were set by us before the restart
+        self._async_seed_commanders(self._wrapped_climate_ids)
+
+        self.scheduler.async_schedule()
+
+    @callback
+    def async_entities_missing(self, entity_ids: set[str]):
+        """Notify about entities that did not come up, until they all have."""
+        missing = set(entity_ids)
+        _LOGGER.warning(
+            "%s: Started without %s, control is limited until they are available",
+            self._data["conf"]["friendly_name"],
+            ", ".join(sorted(missing)),
+        )
+        self.notifications.async_notify(
+            Issue.ENTITIES_MISSING,
+            "Entities Unavailable",
+            f"Started without {', '.join(sorted(missing))}. Control is limited "
+            "until they are available.",
         )
+        unsubs: list[CALLBACK_TYPE] = []
+
+        @callback
+        def _async_unsub():
+            while unsubs:
+                unsubs.pop()()
+
+        @callback
+        def _async_check(_event: Event):
+            missing.difference_update(
+                [
+                    entity_id
+                    for entity_id in missing
+                    if self._hass.states.get(entity_id) is not None
+                ]
+            )
+            if not missing:
+                _async_unsub()
+                self.notifications.async_dismiss(Issue.ENTITIES_MISSING)
+
+        for entity_id in missing:
+            unsubs.append(self.coordinator.async_track_entity(entity_id, _async_check))
+        self._data["callbacks"].append(_async_unsub)
+
+    async def async_reconfigure(self, conf: dict[str, Any]):
+        """Apply changed options in place, rebinding only what changed."""
+        old_conf = dict(self._data["conf"])
+        self._data["conf"].update(conf)
+        changed = {key for key, value in conf.items() if old_conf.get(key) != value}
+        if not changed:
+            return
+        trace_control("Reconfiguring: %s", ", ".join(sorted(changed)))
+
+        if "update_debounce" in changed:
+            self.scheduler.debounce = conf["update_debounce"]
+        if changed & {"control_mode", "predictive_lookahead"}:
+            await self._async_setup_predictive()
+        if changed & {"window_threshold", "window_pause"}:
+            self.window.threshold = conf["window_threshold"]
+            self.window.pause = conf["window_pause"]
+        if "window_sensor" in changed:
+            self._async_bind_window_sensor(conf["window_sensor"])
+            self.window.async_update_contact(
+                None
+                if self._window_sensor_id is None
+                else self._hass.states.get(self._window_sensor_id)
+            )
 
-        # Setup Temperature Sensor Listener
-        self._data["callbacks"].append(
-            async_track_state_change_event(
-                hass,
-                [self._temperature_sensor_id],
-                self._temperature_sensor_state_change,
+        if "wrapped_climate_ids" in changed:
+            added = [
+                entity_id
+                for entity_id in conf["wrapped_climate_ids"]
+                if entity_id not in self.commanders
+            ]
+            self._async_bind_valves(conf["wrapped_climate_ids"])
+            self._async_seed_commanders(added)
+
+        # Sensors that are new or got a new filter start over from history
+        sensor_ids = conf["temperature_sensor_ids"]
+        added = [
+            entity_id
+            for entity_id in sensor_ids
+            if entity_id not in self.sensor_filters
+        ]
+        if changed & {"temperature_sensor_ids", "sensor_weights"}:
+            self._async_bind_sensors(sensor_ids)
+        reseed = added
+        if changed & {"sensor_filter", "filter_max_rate"}:
+            self.sensor_filters = {
+                entity_id: self._new_sensor_filter() for entity_id in sensor_ids
+            }
+            reseed = list(sensor_ids)
+        await self._async_seed_sensors(reseed)
+        if (temperature := self._aggregate_temperature()) is not None:
+            self._state.temperature = temperature
+
+        self.scheduler.async_schedule()
+
+    async def _async_setup_predictive(self):
+        """Create, update or drop the predictive control as configured."""
+        conf = self._data["conf"]
+        if conf["control_mode"] != CONTROL_MODE_PREDICTIVE:
+            self.predictive = None
+        elif self.predictive is not None:
+            self.predictive.lookahead = conf["predictive_lookahead"]
+        else:
+            self.predictive = PredictiveControl(
+                self._hass, self._entry_id, conf["predictive_lookahead"]
+            )
+            await self.predictive.async_load()
+
+    @callback
+    def _async_bind_valves(self, entity_ids: list[str]):
+        """Track exactly the given wrapped climates."""
+        for entity_id in set(self.commanders) - set(entity_ids):
+            self._unsub_entities.pop(entity_id)()
+            self.safety.pop(entity_id).async_shutdown()
+            self.pipeline.async_discard(entity_id)
+            self.commanders.pop(entity_id).async_shutdown()
+        for entity_id in entity_ids:
+            if entity_id in self.commanders:
+                continue
+            self.commanders[entity_id] = ClimateCommander(
+                self.coordinator, entity_id, self.pipeline
+            )
+            self.safety[entity_id] = SafetyChecker(self._hass, self, entity_id)
+            self._unsub_entities[entity_id] = self.coordinator.async_track_entity(
+                entity_id, self._wrapped_climate_state_change
             )
+        self._wrapped_climate_ids = list(entity_ids)
+
+    @callback
+    def _async_bind_sensors(self, entity_ids: list[str]):
+        """Track exactly the given temperature sensors."""
+        for entity_id in set(self.sensor_filters) - set(entity_ids):
+            self._unsub_entities.pop(entity_id)()
+            del self.sensor_filters[entity_id]
+            self._sensor_values.pop(entity_id, None)
+        for entity_id in entity_ids:
+            if entity_id in self.sensor_filters:
+                continue
+            self.sensor_filters[entity_id] = self._new_sensor_filter()
+            self._unsub_entities[entity_id] = self.coordinator.async_track_entity(
+                entity_id, self._temperature_sensor_state_change
+            )
+        self._temperature_sensor_ids = list(entity_ids)
+        self._sensor_weights = dict(
+            zip(entity_ids, self._data["conf"]["sensor_weights"])
         )
 
-        # Periodic Safety Check
-        self._data["callbacks"].append(
-            async_track_time_interval(
-                self._hass, self._periodic_safety_check, timedelta(minutes=1)
+    @callback
+    def _async_bind_window_sensor(self, entity_id: str | None):
+        """Track the given window contact sensor, if any."""
+        if self._window_sensor_id is not None:
+            self._unsub_entities.pop(self._window_sensor_id)()
+        self._window_sensor_id = entity_id
+        if entity_id is not None:
+            self._unsub_entities[entity_id] = self.coordinator.async_track_entity(
+                entity_id, self._window_sensor_state_change
             )
+
+    @callback
+    def _async_unbind_all(self):
+        for unsub in self._unsub_entities.values():
+            unsub()
+        self._unsub_entities.clear()
+        for checker in self.safety.values():
+            checker.async_shutdown()
+        for commander in self.commanders.values():
+            commander.async_shutdown()
+
+    def _new_sensor_filter(self) -> SensorFilter:
+        return SensorFilter(
+            self._data["conf"]["sensor_filter"], self._data["conf"]["filter_max_rate"]
         )
 
-        self._hass.add_job(self.update)
+    async def _async_seed_sensors(self, entity_ids: list[str]):
+        """Warm up the filters of sensors and take their current values."""
+        sensor_states = [
+            state
+            for entity_id in entity_ids
+            if (state := self._hass.states.get(entity_id)) is not None
+        ]
+        await asyncio.gather(
+            *(
+                self._async_warm_start_filter(state.entity_id, state.last_updated)
+                for state in sensor_states
+            )
+        )
+        for state in sensor_states:
+            self._process_sample(state)
+
+    @callback
+    def _async_seed_commanders(self, entity_ids: list[str]):
+        """Take the current targets of wrapped climates as the last commanded."""
+        for entity_id in entity_ids:
+            wrapped_climate = ClimateState.from_hass(self._hass, entity_id)
+            if wrapped_climate is not None:
+                self.commanders[
+                    entity_id
+                ].last_temperature = wrapped_climate.target_temperature
+
+    async def _async_warm_start_filter(self, entity_id: str, before: datetime):
+        """Replay a sensor's recent history into its sensor filter."""
+        sensor_filter = self.sensor_filters[entity_id]
+        if sensor_filter.mode == FILTER_NONE and not sensor_filter.max_rate:
+            return
+
+        states = await async_get_recent_states(
+            self._hass,
+            entity_id,
+            WARM_START_PERIOD,
+            WARM_START_MAX_SAMPLES,
+            before,
+        )
+        for state in states:
+            try:
+                value = float(state.state)
+            except ValueError:
+                continue
+            sensor_filter.process(value, state.last_updated)
+        trace_sensor(
+            "Warmed up the sensor filter with %d samples of %s",
+            len(states),
+            entity_id,
+        )
+
+    def _process_sample(self, state: State) -> bool:
+        """Filter a sensor state into the sensor values.
+
+        Returns False if the sample was rejected as an outlier. An unusable
+        state drops the sensor from the aggregation until it reports again.
+        """
+        try:
+            value = float(state.state)
+        except ValueError:
+            _LOGGER.warning(
+                "Temperature State of %s couldn't be processed: %s",
+                state.entity_id,
+                state.state,
+            )
+            self._sensor_values.pop(state.entity_id, None)
+            return True
+        trace_sensor("Receiving new current Temperature: %s", value)
+
+        # Smooth and reject outliers before the value reaches the control loop
+        value = self.sensor_filters[state.entity_id].process(value, state.last_updated)
+        if value is None:
+            trace_sensor("Temperature sample rejected as outlier: %s", state.state)
+            return False
+        self._sensor_values[state.entity_id] = value
+        return True
+
+    def _aggregate_temperature(self) -> float | None:
+        return aggregate(
+            self._sensor_values,
+            self._data["conf"]["sensor_aggregation"],
+            self._sensor_weights,
+        )
+
+    @property
+    def state(self) -> IntegrationState:
+        """Return the shared integration state."""
+        return self._state
+
+    @property
+    def wrapped_climate_ids(self) -> list[str]:
+        """Return the entity ids of the wrapped climates."""
+        return self._wrapped_climate_ids
+
+    @property
+    def command_stats(self) -> dict[str, int]:
+        """Return the command counters, summed over all valves."""
+        stats = Counter()
+        for commander in self.commanders.values():
+            stats.update(commander.stats)
+        return dict(stats)
+
+    def diagnostics(self) -> dict[str, Any]:
+        """Return counters and statistics of the control loop."""
+        diagnostics = {
+            "metrics": self.metrics.as_dict(self._hass.loop.time()),
+            "scheduler": self.scheduler.stats,
+            "commands": self.command_stats,
+            "command_pipeline": self.pipeline.stats,
+            "valves": {
+                entity_id: {
+                    "commands": commander.stats,
+                    "service_calls": dict(commander.calls),
+                    "safety_checks": self.safety[entity_id].stats,
+                }
+                for entity_id, commander in self.commanders.items()
+            },
+            "sensors": {
+                entity_id: {
+                    "value": self._sensor_values.get(entity_id),
+                    "filter": sensor_filter.stats,
+                }
+                for entity_id, sensor_filter in self.sensor_filters.items()
+            },
+            "deferred_transitions": self.deferred_transitions,
+            "fast_path_samples": self.fast_path_samples,
+            "decision_log": self.decision_log.stats,
+            "notifications": self.notifications.stats,
+            "schedule": self.schedule.stats,
+            "window": self.window.stats,
+            "state_writes": {
+                platform: self._data[platform].write_stats
+                for platform in ("climate", "sensor", "switch")
+            },
+        }
+        if self.predictive is not None:
+            diagnostics["thermal_model"] = self.predictive.model.as_dict()
+        return diagnostics
 
     #
     # Callbacks
@@ -90,192 +473,275 @@ class Logic:
         new_state = event.data.get("new_state")
         if new_state is None:
             return
+        wrapped_climate = ClimateState(new_state)
+        commander = self.commanders[wrapped_climate.entity_id]
+        commander.async_observe(wrapped_climate)
+
+        # Showing up late, its target was not changed externally
+        if event.data.get("old_state") is None:
+            commander.last_temperature = wrapped_climate.target_temperature
 
         # Turned off externally -> Turn to manual immediately
-        if new_state.state == "off":
-            _LOGGER.debug(
-                "Wrapped Climate State Change: Climate Turned Off - Turning back on now"
-            )
-            await self._hass.services.async_call(
-                DOMAIN_CLIMATE,
-                SERVICE_SET_HVAC_MODE,
-                {
-                    "entity_id": self._wrapped_climate_id,
-                    "hvac_mode": "heat",
-                },
+        if wrapped_climate.hvac_mode == HVACMode.OFF:
+            trace_climate(
+                "Wrapped Climate State Change: %s Turned Off - Turning back on now",
+                wrapped_climate.entity_id,
             )
+            commander.async_set_hvac_mode(HVACMode.HEAT)
             return
 
         # Target Temperature Changed
-        new_target_temp = float(new_state.attributes.get(ATTR_TEMPERATURE))
-        if new_target_temp != self._last_target_temperature:
-            _LOGGER.debug(
-                f"Wrapped Climate State Change: Target Temperature: {new_target_temp}, Saved: {self._last_target_temperature}"
+        new_target_temp = wrapped_climate.target_temperature
+        if new_target_temp != commander.last_temperature:
+            trace_climate(
+                "Wrapped Climate State Change: %s Target Temperature: %s, Saved: %s",
+                wrapped_climate.entity_id,
+                new_target_temp,
+                commander.last_temperature,
             )
-            async_create_notification(
-                self._hass,
-                title="Climate Wrapper | External Temperature Change",
-                message=f"Climate target temperature change (to {new_target_temp}) detected.",
+            self.notifications.async_notify(
+                Issue.EXTERNAL_CHANGE,
+                "External Temperature Change",
+                f"Climate {wrapped_climate.entity_id} target temperature change (to {new_target_temp}) detected.",
+            )
+            self._data["sensor"].async_external_change(
+                wrapped_climate.entity_id, new_target_temp
             )
-            self._hass.async_add_job(self._data["sensor"].external_change)
 
-        await self.update()
+        self.scheduler.async_schedule()
 
     async def _temperature_sensor_state_change(self, event: Event):
-        """Handle state changes of the temperature sensor."""
+        """Handle state changes of a temperature sensor."""
         new_state = event.data.get("new_state")
+        if new_state is None:
+            self._sensor_values.pop(event.data["entity_id"], None)
+            sampled_at = event.time_fired
+        elif self._process_sample(new_state):
+            sampled_at = new_state.last_updated
+        else:
+            return
 
-        # Grab current temperature from state
-        try:
-            cur_temp = float(new_state.state)
-        except Exception as e:
-            _LOGGER.warn(f"Temperature State couldn't be processed: {e}")
+        # Combine the sensors, keeping the last value if none is usable
+        cur_temp = self._aggregate_temperature()
+        if cur_temp is None:
             return
-        _LOGGER.debug(f"Receiving new current Temperature: {cur_temp}")
 
         # Set current temperature
-        if new_state.state is not None:
-            self._state.temperature = cur_temp
+        self._state.temperature = cur_temp
+        if self.predictive is not None:
+            self.predictive.async_add_sample(cur_temp, sampled_at, self._state.heating)
+            # The switch points move as the rates are learned
+            self._async_update_dead_zone()
+        self.window.async_add_sample(cur_temp, sampled_at)
+
+        # Inside the dead zone the decision stands, only the display changes
+        dead_zone = self._dead_zone
+        if dead_zone is not None and dead_zone[0] <= cur_temp <= dead_zone[1]:
+            self.fast_path_samples += 1
+            self._evaluated_temperature = cur_temp
+            self._data["climate"].async_schedule_write()
+            return
 
-        await self.update()
+        # Leaving the dead zone changes the decision, however small the step;
+        # without one, only a meaningful change warrants an evaluation
+        if (
+            dead_zone is None
+            and self._evaluated_temperature is not None
+            and abs(cur_temp - self._evaluated_temperature)
+            < self._data["conf"]["filter_threshold"]
+        ):
+            return
+        self._evaluated_temperature = cur_temp
 
-    async def _periodic_safety_check(self, _):
-        """Evaluate the current state and check if everything is functioning correctly."""
-        error = False
+        self.scheduler.async_schedule()
 
-        if not self._state.enable:
-            return
+    async def _window_sensor_state_change(self, event: Event):
+        """Handle state changes of the window contact sensor."""
+        self.window.async_update_contact(event.data.get("new_state"))
 
-        # Check HVACMode
-        if self._wrapped_climate.hvac_mode != HVACMode.HEAT:
-            error = True
-            _LOGGER.debug(
-                f"Safety Check: HVACMode set to {self._wrapped_climate.hvac_mode}, Expected: {HVACMode.HEAT}"
-            )
-            if self._safety_check_timeout >= SAFETY_CHECK_TIMEOUT:
-                async_create_notification(
-                    self._hass,
-                    title="Climate Wrapper | Safety Check",
-                    message=f"""
-                        Safety check failed: Heating Mode mismatch.
-                        -> Currently {self._wrapped_climate.hvac_mode}
-                        -> Should be {HVACMode.HEAT}
-                        Please check manually.""",
-                    notification_id="climate_wrapper.safety_check_action",
-                )
-
-        # Check HVACAction
-        if self._state.hvac_action != self._wrapped_climate.hvac_action:
-            error = True
-            _LOGGER.debug(
-                f"Safety Check: HVACAction set to {self._wrapped_climate.hvac_action}, Expected: {self._state.hvac_action}"
-            )
-            if self._safety_check_timeout >= SAFETY_CHECK_TIMEOUT:
-                async_create_notification(
-                    self._hass,
-                    title="Climate Wrapper | Safety Check",
-                    message=f"""
-                        Safety check failed: Heating Action mismatch.
-                        -> Currently {self._wrapped_climate.hvac_action}
-                        -> Should be {self._state.hvac_action}
-                        Please check manually.""",
-                    notification_id="climate_wrapper.safety_check_action",
-                )
-
-        expected_temp, min_temp, max_temp = self.calculate_target_temp()
-        if not (min_temp <= self._wrapped_climate.target_temperature <= max_temp):
-            error = True
-            _LOGGER.debug(
-                f"Safety Check: Target Temperature set to {self._wrapped_climate.target_temperature}, Expected: {expected_temp} ({min_temp} - {max_temp})"
-            )
-            if self._safety_check_timeout >= SAFETY_CHECK_TIMEOUT:
-                async_create_notification(
-                    self._hass,
-                    title="Climate Wrapper | Safety Check",
-                    message=f"""
-                        Safety check failed: Temperature Difference mismatch.
-                        -> Current Temperature: {self._wrapped_climate.temperature}
-                        -> Target Temperature: {self._wrapped_climate.target_temperature}
-                        -> Should be: {expected_temp}
-                        Please check manually.""",
-                    notification_id="climate_wrapper.safety_check_difference",
-                )
-
-        # Increase Timeout
-        if error:
-            self._safety_check_timeout += 1
-        else:
-            async_dismiss_notification(
-                self._hass, "climate_wrapper.safety_check_action"
-            )
-            async_dismiss_notification(
-                self._hass, "climate_wrapper.safety_check_difference"
-            )
-            self._safety_check_timeout = 0
+    @callback
+    def _async_apply_scheduled_target(self, temperature: float):
+        """Take over a target temperature from the schedule."""
+        self._state.target_temperature = temperature
+        self.scheduler.async_schedule()
 
     #
     # Control Functions
     #
 
+    async def async_refresh(self):
+        """Evaluate immediately, e.g. after a user action."""
+        await self.scheduler.async_refresh()
+
+    async def async_wait_acknowledged(self) -> None:
+        """Wait for the valves to confirm all pending commands."""
+        await asyncio.gather(
+            *(
+                commander.async_wait_acknowledged()
+                for commander in self.commanders.values()
+            )
+        )
+
     async def update(self):
+        started = time.perf_counter()
+        try:
+            await self._async_update()
+        finally:
+            self.metrics.record_update(
+                self._hass.loop.time(), time.perf_counter() - started
+            )
+
+    async def _async_update(self):
+        wrapped_climates = [
+            wrapped_climate
+            for entity_id in self._wrapped_climate_ids
+            if (wrapped_climate := ClimateState.from_hass(self._hass, entity_id))
+            is not None
+        ]
+
+        previous_action = self._state.hvac_action
+
         if self._state.hvac_mode == HVACMode.OFF:
             self._state.hvac_action = HVACAction.IDLE
+            reason = Reason.MODE_OFF
+
+        elif self.window.open:
+            self._state.hvac_action = HVACAction.IDLE
+            reason = Reason.WINDOW_OPEN
 
         elif self._state.hvac_mode == HVACMode.HEAT:
             self._state.hvac_action = HVACAction.HEATING
+            reason = Reason.MODE_HEAT
 
-        elif self._state.hvac_mode == HVACMode.AUTO:
-            await self._update_action_via_auto()
+        else:
+            reason = await self._update_action_via_auto()
+
+        if self._state.hvac_action != previous_action:
+            self._last_action_change = dt_util.utcnow()
+
+        # Only queues the commands, the pipeline sends them
+        results = [
+            self._set_wrapped_climate(wrapped_climate)
+            for wrapped_climate in wrapped_climates
+        ]
+        for wrapped_climate in wrapped_climates:
+            self.safety[wrapped_climate.entity_id].async_evaluate(wrapped_climate)
+
+        # The log keeps one command per decision, they only differ in value
+        command, command_value = next(
+            ((c, v) for c, v in results if c is not Command.NONE),
+            (Command.NONE, None),
+        )
 
-        await self._set_wrapped_climate()
+        self.decision_log.async_record(
+            self._state.temperature,
+            self._state.target_temperature,
+            self._state.hvac_action,
+            command,
+            command_value,
+            reason,
+        )
+        self._async_update_dead_zone()
+
+        # Written once per loop iteration, and only if something changed
+        self._data["climate"].async_schedule_write()
+        self._data["sensor"].async_schedule_write()
+
+    @callback
+    def _async_update_dead_zone(self):
+        """Precompute the temperatures at which the decision cannot change.
+
+        Only recomputed if the mode, switch points, action or window changed.
+        Predictive control moves the switch points as it learns.
+        """
+        variance = self._data["conf"]["temperature_variance"]
+        min_temp = self._state.target_temperature - variance
+        max_temp = self._state.target_temperature + variance
+        if self.predictive is not None:
+            min_temp, max_temp = self.predictive.switch_points(min_temp, max_temp)
+        inputs = (
+            self._state.hvac_mode,
+            min_temp,
+            max_temp,
+            self._state.heating,
+            self.window.open,
+        )
+        if inputs == self._dead_zone_inputs:
+            return
+        self._dead_zone_inputs = inputs
+
+        if self._state.hvac_mode != HVACMode.AUTO or self.window.open:
+            self._dead_zone = (-math.inf, math.inf)
+        elif self._state.heating:
+            self._dead_zone = (-math.inf, max_temp)
+        else:
+            self._dead_zone = (min_temp, math.inf)
 
-        if self._data["climate"] is not None:
-            self._data["climate"].async_write_ha_state()
-        if self._data["sensor"] is not None:
-            self._data["sensor"].async_write_ha_state()
+    def _set_wrapped_climate(
+        self, wrapped_climate: ClimateState
+    ) -> tuple[Command, Any]:
+        """Bring a wrapped climate in line. Return the last command sent."""
+        commander = self.commanders[wrapped_climate.entity_id]
+        command, command_value = Command.NONE, None
 
-    async def _set_wrapped_climate(self):
         # Check if Climate needs to be turned on
-        if self._wrapped_climate.hvac_mode != HVACMode.HEAT:
-            _LOGGER.debug("Setting Wrapped Climate HVACMode to 'heat'")
-            await self._hass.services.async_call(
-                DOMAIN_CLIMATE,
-                SERVICE_SET_HVAC_MODE,
-                {
-                    "entity_id": self._wrapped_climate_id,
-                    "hvac_mode": "heat",
-                },
+        if wrapped_climate.hvac_mode != HVACMode.HEAT:
+            trace_control(
+                "Setting Wrapped Climate %s HVACMode to 'heat'",
+                wrapped_climate.entity_id,
             )
+            if commander.async_set_hvac_mode(HVACMode.HEAT):
+                command, command_value = Command.SET_HVAC_MODE, HVACMode.HEAT
 
         # Check if target temp update is necessary
-        expected_temp, min_temp, max_temp = self.calculate_target_temp()
+        expected_temp, min_temp, max_temp = self.calculate_target_temp(wrapped_climate)
         if self._state.enable and not (
-            min_temp <= self._wrapped_climate.target_temperature <= max_temp
+            min_temp <= wrapped_climate.target_temperature <= max_temp
         ):
-            _LOGGER.debug(
-                f"Setting Wrapped Climate Target Temperature to {expected_temp}. Current: {self._wrapped_climate.target_temperature}, Expected Min: {min_temp}, Expected Max: {max_temp}"
+            trace_control(
+                "Setting Wrapped Climate %s Target Temperature to %s. Current: %s, Expected Min: %s, Expected Max: %s",
+                wrapped_climate.entity_id,
+                expected_temp,
+                wrapped_climate.target_temperature,
+                min_temp,
+                max_temp,
             )
-            self._last_target_temperature = expected_temp
-
-            # Update Wrapped Climate to reflect status
-            await self._hass.services.async_call(
-                DOMAIN_CLIMATE,
-                SERVICE_SET_TEMPERATURE,
-                {
-                    "entity_id": self._wrapped_climate_id,
-                    "temperature": self._last_target_temperature,
-                },
+
+            # Update Wrapped Climate to reflect status, unless an equivalent
+            # command is still waiting for the device to confirm it
+            if commander.async_set_temperature(expected_temp, min_temp, max_temp):
+                command, command_value = Command.SET_TEMPERATURE, expected_temp
+
+        return command, command_value
+
+    async def _update_action_via_auto(self) -> Reason:
+        action = self._state.hvac_action
+        reason = Reason.WITHIN_BAND
+
+        # No sensor reported yet, the action stands
+        if self._state.temperature is None:
+            return Reason.NO_TEMPERATURE
+
+        if self.predictive is not None:
+            variance = self._data["conf"]["temperature_variance"]
+            heat = self.predictive.should_heat(
+                self._state.heating,
+                self._state.temperature,
+                self._state.target_temperature - variance,
+                self._state.target_temperature + variance,
             )
+            action = HVACAction.HEATING if heat else HVACAction.IDLE
+            reason = Reason.PREDICTED_HEAT if heat else Reason.PREDICTED_IDLE
 
-    async def _update_action_via_auto(self):
         # If heating -> Does it need to be turned off?
-        if self._state.heating:
+        elif self._state.heating:
             max_temp = (
                 self._state.target_temperature
                 + self._data["conf"]["temperature_variance"]
             )
             if self._state.temperature > max_temp:
-                self._state.hvac_action = HVACAction.IDLE
+                action = HVACAction.IDLE
+                reason = Reason.ABOVE_MAX
 
         # If not heating -> Does it need to be turned on?
         else:
@@ -284,12 +750,55 @@ class Logic:
                 - self._data["conf"]["temperature_variance"]
             )
             if self._state.temperature < min_temp:
-                self._state.hvac_action = HVACAction.HEATING
+                action = HVACAction.HEATING
+                reason = Reason.BELOW_MIN
+
+        if action != self._state.hvac_action and self._hold_transition():
+            return Reason.HELD
+        self._state.hvac_action = action
+        return reason
 
-    def calculate_target_temp(self) -> (float, float, float):
+    def _hold_transition(self) -> bool:
+        """Return True if the current action has not yet run for its minimum time."""
+        if self._state.heating:
+            window = self._data["conf"]["min_run_time"]
+        else:
+            window = self._data["conf"]["min_idle_time"]
+        if not window or self._last_action_change is None:
+            return False
+
+        remaining = (
+            window * 60 - (dt_util.utcnow() - self._last_action_change).total_seconds()
+        )
+        if remaining <= 0:
+            return False
+
+        # Re-evaluate once, when the window expires; later evaluations
+        # within the window hold the same transition
+        if self._unsub_cycle_timer is None:
+            self.deferred_transitions += 1
+            self._unsub_cycle_timer = self.coordinator.async_schedule_deadline(
+                remaining, self._async_cycle_window_expired
+            )
+        return True
+
+    @callback
+    def _async_cycle_window_expired(self):
+        self._unsub_cycle_timer = None
+        self.scheduler.async_schedule()
+
+    @callback
+    def _async_cancel_cycle_timer(self):
+        if self._unsub_cycle_timer is not None:
+            self._unsub_cycle_timer()
+            self._unsub_cycle_timer = None
+
+    def calculate_target_temp(
+        self, wrapped_climate: ClimateState
+    ) -> (float, float, float):
         if self._state.heating:
-            target = self._wrapped_climate.temperature + TEMPERATURE_DIFF
+            target = wrapped_climate.temperature + TEMPERATURE_DIFF
             return (target, target, 30.0)
         else:
-            target = self._wrapped_climate.temperature - TEMPERATURE_DIFF
+            target = wrapped_climate.temperature - TEMPERATURE_DIFF
             return (target, 0, target)
@@ -0,0 +1,93 @@
+"""Low-overhead counters and histograms for the control loop."""
+from __future__ import annotations
+
+from bisect import bisect_left
+
+# 10 µs up to ~21 s, doubling per bucket
+LATENCY_BUCKETS = tuple(1e-5 * 2**i for i in range(22))
+
+
+class Histogram:
+    """Fixed-bucket histogram; recording is a bisect and an increment."""
+
+    __slots__ = ("bounds", "counts", "total")
+
+    def __init__(self, bounds: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        """Initialize the histogram."""
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total = 0
+
+    def record(self, value: float) -> None:
+        """Add a value."""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.total += 1
+
+    def percentile(self, percent: float) -> float | None:
+        """Return the upper bound of the bucket holding the given percentile."""
+        if not self.total:
+            return None
+
+        rank = self.total * percent / 100
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return self.bounds[min(index, len(self.bounds) - 1)]
+        return self.bounds[-1]
+
+
+class RateCounter:
+    """Count events per minute of a monotonic clock."""
+
+    __slots__ = ("total", "_minute", "_current", "_previous")
+
+    def __init__(self) -> None:
+        """Initialize the counter."""
+        self.total = 0
+        self._minute = 0
+        self._current = 0
+        self._previous = 0
+
+    def record(self, now: float) -> None:
+        """Add an event at monotonic time now (s)."""
+        self._roll(int(now // 60))
+        self._current += 1
+        self.total += 1
+
+    def per_minute(self, now: float) -> int:
+        """Return the number of events in the last complete minute."""
+        self._roll(int(now // 60))
+        return self._previous
+
+    def _roll(self, minute: int) -> None:
+        if minute == self._minute:
+            return
+        self._previous = self._current if minute == self._minute + 1 else 0
+        self._minute = minute
+        self._current = 0
+
+
+class ControlLoopMetrics:
+    """Metrics of one entry's control loop."""
+
+    __slots__ = ("updates", "update_latency")
+
+    def __init__(self) -> None:
+        """Initialize the metrics."""
+        self.updates = RateCounter()
+        self.update_latency = Histogram()
+
+    def record_update(self, now: float, duration: float) -> None:
+        """Record one Logic.update() run of duration seconds."""
+        self.updates.record(now)
+        self.update_latency.record(duration)
+
+    def as_dict(self, now: float) -> dict[str, float | int | None]:
+        """Return the metrics."""
+        return {
+            "updates_total": self.updates.total,
+            "updates_per_minute": self.updates.per_minute(now),
+            "update_latency_p50": self.update_latency.percentile(50),
+            "update_latency_p99": self.update_latency.percentile(99),
+        }
@@ -0,0 +1,117 @@
+"""Persistent notifications of one Climate Wrapper entry."""
+from __future__ import annotations
+
+from enum import StrEnum
+
+from homeassistant.components.persistent_notification import (
+    Notification,
+    UpdateType,
+    async_create as async_create_notification,
+    async_dismiss as async_dismiss_notification,
+    async_register_callback,
+)
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, NOTIFICATION_MIN_INTERVAL
+
+
+class Issue(StrEnum):
+    """Issue types, each shown as at most one notification per entry."""
+
+    EXTERNAL_CHANGE = "external_change"
+    SAFETY_CHECK_MODE = "safety_check_mode"
+    SAFETY_CHECK_ACTION = "safety_check_action"
+    SAFETY_CHECK_DIFFERENCE = "safety_check_difference"
+    ENTITIES_MISSING = "entities_missing"
+
+
+class NotificationManager:
+    """Create and dismiss an entry's notifications on transitions only.
+
+    Notifications are keyed by issue and an optional subject, such as the
+    valve an issue is about. What is currently shown is tracked, including
+    dismissals by the user, so an unchanged notification is not re-sent and
+    a dismiss is only sent for a shown one. A notification is created or
+    updated at most once per NOTIFICATION_MIN_INTERVAL seconds per key.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, name: str) -> None:
+        """Initialize the manager."""
+        self._hass = hass
+        self._entry_id = entry_id
+        self._name = name
+        self._shown: dict[tuple[Issue, str | None], str] = {}
+        self._last_sent: dict[tuple[Issue, str | None], float] = {}
+        self._unsub_updates = async_register_callback(hass, self._async_updated)
+
+        # Statistics
+        self.created = 0
+        self.dismissed = 0
+        self.deduplicated = 0
+        self.rate_limited = 0
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the notification counters."""
+        return {
+            "shown": len(self._shown),
+            "created": self.created,
+            "dismissed": self.dismissed,
+            "deduplicated": self.deduplicated,
+            "rate_limited": self.rate_limited,
+        }
+
+    def notification_id(self, issue: Issue, subject: str | None = None) -> str:
+        """Return the notification id of an issue of this entry."""
+        if subject is None:
+            return f"{DOMAIN}.{self._entry_id}.{issue}"
+        return f"{DOMAIN}.{self._entry_id}.{issue}.{subject}"
+
+    @callback
+    def async_notify(
+        self, issue: Issue, title: str, message: str, subject: str | None = None
+    ) -> None:
+        """Show a notification for issue, unless it is already shown."""
+        key = (issue, subject)
+        if self._shown.get(key) == message:
+            self.deduplicated += 1
+            return
+
+        now = self._hass.loop.time()
+        last_sent = self._last_sent.get(key)
+        if last_sent is not None and now - last_sent < NOTIFICATION_MIN_INTERVAL:
+            self.rate_limited += 1
+            return
+
+        self._shown[key] = message
+        self._last_sent[key] = now
+        self.created += 1
+        async_create_notification(
+            self._hass,
+            message,
+            title=f"Climate Wrapper | {self._name} | {title}",
+            notification_id=self.notification_id(issue, subject),
+        )
+
+    @callback
+    def async_dismiss(self, issue: Issue, subject: str | None = None) -> None:
+        """Dismiss the notification of issue, if it is shown."""
+        if self._shown.pop((issue, subject), None) is None:
+            return
+        self.dismissed += 1
+        async_dismiss_notification(self._hass, self.notification_id(issue, subject))
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Stop tracking the shown notifications."""
+        self._unsub_updates()
+
+    @callback
+    def _async_updated(
+        self, update_type: UpdateType, notifications: dict[str, Notification]
+    ) -> None:
+        if update_type != UpdateType.REMOVED or not self._shown:
+            return
+        for key in list(self._shown):
+            if self.notification_id(*key) in notifications:
+                del self._shown[key]
@@ -0,0 +1,121 @@
+"""Command pipeline towards the wrapped climates of Climate Wrapper."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.components.climate.const import DOMAIN as DOMAIN_CLIMATE
+import logging
+
+from .trace import trace_command
+from .const import COMMAND_CALL_TIMEOUT, COMMAND_QUEUE_SIZE
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class CommandPipeline:
+    """Send an entry's service calls from a single consumer task.
+
+    Decisions only queue intents, keyed by entity and service, so they are
+    never interleaved with a call in flight. A newer intent replaces a queued
+    one with the same key, only the latest decision goes out. Once maxsize
+    intents are queued the oldest one is dropped. Calls are awaited, at most
+    COMMAND_CALL_TIMEOUT seconds each, so failures are counted; intents
+    queued meanwhile keep being merged.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, name: str, maxsize: int = COMMAND_QUEUE_SIZE
+    ) -> None:
+        """Initialize the pipeline."""
+        self._hass = hass
+        self._name = name
+        self._maxsize = maxsize
+        self._intents: dict[tuple[str, str], dict[str, Any]] = {}
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+        # Statistics
+        self.submitted = 0
+        self.replaced = 0
+        self.dropped = 0
+        self.sent = 0
+        self.failed = 0
+        self.max_depth = 0
+
+    @property
+    def depth(self) -> int:
+        """Return the number of queued intents."""
+        return len(self._intents)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the pipeline counters."""
+        return {
+            "depth": self.depth,
+            "max_depth": self.max_depth,
+            "submitted": self.submitted,
+            "replaced": self.replaced,
+            "dropped": self.dropped,
+            "sent": self.sent,
+            "failed": self.failed,
+        }
+
+    @callback
+    def async_submit(self, service: str, service_data: dict[str, Any]) -> None:
+        """Queue a climate service call, replacing a queued one of the same kind."""
+        key = (service_data["entity_id"], service)
+        self.submitted += 1
+        if key in self._intents:
+            self.replaced += 1
+        elif len(self._intents) >= self._maxsize:
+            dropped = next(iter(self._intents))
+            del self._intents[dropped]
+            self.dropped += 1
+            _LOGGER.warning("%s: Command queue full, dropped %s", self._name, dropped)
+        self._intents[key] = service_data
+        self.max_depth = max(self.max_depth, len(self._intents))
+
+        if self._task is None:
+            self._task = self._hass.async_create_background_task(
+                self._async_consume(), f"{self._name} commands"
+            )
+        self._wakeup.set()
+
+    @callback
+    def async_discard(self, entity_id: str) -> None:
+        """Drop the queued intents for an entity."""
+        for key in [key for key in self._intents if key[0] == entity_id]:
+            del self._intents[key]
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Drop the queued intents and cancel the consumer."""
+        self._intents.clear()
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    async def _async_consume(self) -> None:
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            while self._intents:
+                # Oldest first; a replaced intent keeps its place in the queue
+                key = next(iter(self._intents))
+                service_data = self._intents.pop(key)
+                trace_command("Sending %s to %s", key[1], key[0])
+                try:
+                    async with asyncio.timeout(COMMAND_CALL_TIMEOUT):
+                        await self._hass.services.async_call(
+                            DOMAIN_CLIMATE, key[1], service_data, blocking=True
+                        )
+                except TimeoutError:
+                    self.failed += 1
+                    _LOGGER.warning("%s: Timeout sending %s", self._name, key)
+                except Exception:  # pylint: disable=broad-except
+                    self.failed += 1
+                    _LOGGER.exception("%s: Error sending %s", self._name, key)
+                else:
+                    self.sent += 1
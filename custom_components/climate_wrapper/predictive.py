@@ -0,0 +1,164 @@
+"""Predictive heating control for Climate Wrapper."""
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+
+from .const import (
+    DOMAIN,
+    PREDICTIVE_DEFAULT_RATE,
+    PREDICTIVE_FIT_PERIOD,
+    PREDICTIVE_LEARNING_RATE,
+    PREDICTIVE_MAX_RATE,
+    PREDICTIVE_MAX_SAMPLE_GAP,
+    PREDICTIVE_MIN_BAND,
+    PREDICTIVE_MIN_SAMPLES,
+    PREDICTIVE_SAVE_DELAY,
+)
+from .window import SlopeWindow
+
+STORAGE_VERSION = 1
+
+
+class ThermalModel:
+    """Online estimate of how fast a room heats up and cools down.
+
+    Rates are in °C per minute and learned as exponential moving averages of
+    the least-squares slope over PREDICTIVE_FIT_PERIOD of samples, attributed
+    to heating or cooling by the wrapper's action. A fit starts over when the
+    action changes, so it never spans both. Fitting over many samples keeps
+    sensor noise, which the clamping to positive rates would turn into a
+    bias, out of the rates.
+    """
+
+    def __init__(
+        self,
+        heating_rate: float = PREDICTIVE_DEFAULT_RATE,
+        cooling_rate: float = PREDICTIVE_DEFAULT_RATE,
+        samples: int = 0,
+    ) -> None:
+        """Initialize the model."""
+        self.heating_rate = heating_rate
+        self.cooling_rate = cooling_rate
+        self.samples = samples
+
+        self._fit = SlopeWindow(PREDICTIVE_FIT_PERIOD)
+        self._fit_heating: bool | None = None
+        self._last_when: datetime | None = None
+
+    def add_sample(self, temperature: float, when: datetime, heating: bool) -> bool:
+        """Learn from a new sample. Return True if a rate was updated."""
+        if self._last_when is not None and when <= self._last_when:
+            return False
+
+        # A new action or a gap in the samples starts a new fit
+        if (
+            heating != self._fit_heating
+            or self._last_when is None
+            or (when - self._last_when).total_seconds() > PREDICTIVE_MAX_SAMPLE_GAP * 60
+        ):
+            self._fit = SlopeWindow(PREDICTIVE_FIT_PERIOD)
+            self._fit_heating = heating
+        self._last_when = when
+
+        self._fit.add(temperature, when.timestamp())
+        if (
+            len(self._fit) < PREDICTIVE_MIN_SAMPLES
+            or self._fit.span < PREDICTIVE_FIT_PERIOD / 2
+            or (slope := self._fit.slope) is None
+        ):
+            return False
+
+        slope *= 60  # °C/min
+        if heating:
+            self.heating_rate = self._learn(self.heating_rate, slope)
+        else:
+            self.cooling_rate = self._learn(self.cooling_rate, -slope)
+        self.samples += 1
+        return True
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the learned parameters."""
+        return {
+            "heating_rate": self.heating_rate,
+            "cooling_rate": self.cooling_rate,
+            "samples": self.samples,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> ThermalModel:
+        """Restore a model from its learned parameters."""
+        return cls(
+            heating_rate=data.get("heating_rate", PREDICTIVE_DEFAULT_RATE),
+            cooling_rate=data.get("cooling_rate", PREDICTIVE_DEFAULT_RATE),
+            samples=data.get("samples", 0),
+        )
+
+    @staticmethod
+    def _learn(rate: float, slope: float) -> float:
+        slope = min(max(slope, 0.0), PREDICTIVE_MAX_RATE)
+        return rate + PREDICTIVE_LEARNING_RATE * (slope - rate)
+
+
+class PredictiveControl:
+    """Switch heating early, based on a learned ThermalModel.
+
+    Heating stops early by how far the room heats up within the lookahead,
+    covering the heat the radiator still releases after switching off, and
+    starts early by how far it cools down, covering the radiator's warm-up
+    time. The offsets shrink as needed to keep PREDICTIVE_MIN_BAND of the
+    band between the switch points, so the relay does not chatter.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, lookahead: float) -> None:
+        """Initialize the predictive control."""
+        self.lookahead = lookahead
+        self.model = ThermalModel()
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, storage_key(entry_id)
+        )
+
+    async def async_load(self) -> None:
+        """Load the learned parameters."""
+        if (data := await self._store.async_load()) is not None:
+            self.model = ThermalModel.from_dict(data)
+
+    @callback
+    def async_add_sample(
+        self, temperature: float, when: datetime, heating: bool
+    ) -> None:
+        """Learn from a new sensor sample and persist the result."""
+        if self.model.add_sample(temperature, when, heating):
+            self._store.async_delay_save(self.model.as_dict, PREDICTIVE_SAVE_DELAY)
+
+    def switch_points(self, min_temp: float, max_temp: float) -> tuple[float, float]:
+        """Return the temperatures below which heating starts and above which it stops."""
+        start_offset = self.model.cooling_rate * self.lookahead
+        stop_offset = self.model.heating_rate * self.lookahead
+        max_offsets = (max_temp - min_temp) * (1 - PREDICTIVE_MIN_BAND)
+        if (offsets := start_offset + stop_offset) > max_offsets:
+            start_offset *= max_offsets / offsets
+            stop_offset *= max_offsets / offsets
+        return min_temp + start_offset, max_temp - stop_offset
+
+    def should_heat(
+        self, heating: bool, temperature: float, min_temp: float, max_temp: float
+    ) -> bool:
+        """Return the desired heating state."""
+        start_at, stop_at = self.switch_points(min_temp, max_temp)
+        if heating:
+            return temperature <= stop_at
+        return temperature < start_at
+
+
+def storage_key(entry_id: str) -> str:
+    """Return the storage key of the learned model of an entry."""
+    return f"{DOMAIN}.{entry_id}.thermal_model"
+
+
+async def async_remove_model(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the learned model of an entry."""
+    await Store(hass, STORAGE_VERSION, storage_key(entry_id)).async_remove()
@@ -0,0 +1,187 @@
+"""Event-driven safety check for Climate Wrapper."""
+from __future__ import annotations
+
+from datetime import timedelta
+from typing import TYPE_CHECKING
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.components.climate.const import HVACMode
+import logging
+
+from .notifications import Issue
+from .state import ClimateState
+from .trace import trace_safety
+from .const import SAFETY_CHECK_TIMEOUT
+
+if TYPE_CHECKING:
+    from .logic import Logic
+
+_LOGGER = logging.getLogger(__name__)
+
+SAFETY_CHECK_ISSUES = (
+    Issue.SAFETY_CHECK_MODE,
+    Issue.SAFETY_CHECK_ACTION,
+    Issue.SAFETY_CHECK_DIFFERENCE,
+)
+
+
+class SafetyChecker:
+    """Check that the wrapped climate follows the wrapper.
+
+    The check runs whenever Logic evaluates a fresh state. The first mismatch
+    arms a single deadline SAFETY_CHECK_TIMEOUT minutes out; only if the
+    mismatch is still present when it fires are notifications raised.
+    """
+
+    def __init__(self, hass: HomeAssistant, logic: Logic, entity_id: str) -> None:
+        """Initialize the safety checker of the wrapped climate entity_id."""
+        self._hass = hass
+        self._logic = logic
+        self._entity_id = entity_id
+        self._unsub_deadline: CALLBACK_TYPE | None = None
+        self._expired = False
+
+        # Statistics
+        self.passed = 0
+        self.mismatched = 0
+        self.alerts = 0
+
+    @callback
+    def async_evaluate(self, wrapped_climate: ClimateState) -> None:
+        """Evaluate the current state and check if everything is functioning correctly."""
+        if not self._logic.state.enable:
+            self._async_reset()
+            return
+
+        if not self._async_check(wrapped_climate, notify=self._expired):
+            self.passed += 1
+            self._async_reset()
+            return
+
+        self.mismatched += 1
+        if self._expired:
+            self.alerts += 1
+
+        # Mismatch: give the wrapped climate time to catch up before alerting
+        if self._unsub_deadline is None and not self._expired:
+            self._unsub_deadline = self._logic.coordinator.async_schedule_deadline(
+                timedelta(minutes=SAFETY_CHECK_TIMEOUT),
+                self._async_deadline_reached,
+            )
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the safety check outcomes."""
+        return {
+            "passed": self.passed,
+            "mismatched": self.mismatched,
+            "alerts": self.alerts,
+        }
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the pending deadline."""
+        if self._unsub_deadline is not None:
+            self._unsub_deadline()
+            self._unsub_deadline = None
+
+    @callback
+    def _async_deadline_reached(self) -> None:
+        self._unsub_deadline = None
+        self._expired = True
+
+        wrapped_climate = ClimateState.from_hass(self._hass, self._entity_id)
+        if wrapped_climate is not None:
+            self.async_evaluate(wrapped_climate)
+
+    @callback
+    def _async_reset(self) -> None:
+        self.async_shutdown()
+        self._expired = False
+
+        # Only sends a dismiss for what is actually shown
+        for issue in SAFETY_CHECK_ISSUES:
+            self._logic.notifications.async_dismiss(issue, self._entity_id)
+
+    @callback
+    def _async_check(self, wrapped_climate: ClimateState, notify: bool) -> bool:
+        """Return True if the wrapped climate does not match the wrapper."""
+        failed = False
+
+        # Check HVACMode
+        if wrapped_climate.hvac_mode != HVACMode.HEAT:
+            failed = True
+            trace_safety(
+                "Safety Check: HVACMode set to %s, Expected: %s",
+                wrapped_climate.hvac_mode,
+                HVACMode.HEAT,
+            )
+            if notify:
+                self._logic.notifications.async_notify(
+                    Issue.SAFETY_CHECK_MODE,
+                    "Safety Check",
+                    f"""
+                        Safety check of {self._entity_id} failed: Heating Mode mismatch.
+                        -> Currently {wrapped_climate.hvac_mode}
+                        -> Should be {HVACMode.HEAT}
+                        Please check manually.""",
+                    self._entity_id,
+                )
+        elif notify:
+            self._logic.notifications.async_dismiss(
+                Issue.SAFETY_CHECK_MODE, self._entity_id
+            )
+
+        # Check HVACAction
+        if self._logic.state.hvac_action != wrapped_climate.hvac_action:
+            failed = True
+            trace_safety(
+                "Safety Check: HVACAction set to %s, Expected: %s",
+                wrapped_climate.hvac_action,
+                self._logic.state.hvac_action,
+            )
+            if notify:
+                self._logic.notifications.async_notify(
+                    Issue.SAFETY_CHECK_ACTION,
+                    "Safety Check",
+                    f"""
+                        Safety check of {self._entity_id} failed: Heating Action mismatch.
+                        -> Currently {wrapped_climate.hvac_action}
+                        -> Should be {self._logic.state.hvac_action}
+                        Please check manually.""",
+                    self._entity_id,
+                )
+        elif notify:
+            self._logic.notifications.async_dismiss(
+                Issue.SAFETY_CHECK_ACTION, self._entity_id
+            )
+
+        expected_temp, min_temp, max_temp = self._logic.calculate_target_temp(
+            wrapped_climate
+        )
+        if not (min_temp <= wrapped_climate.target_temperature <= max_temp):
+            failed = True
+            trace_safety(
+                "Safety Check: Target Temperature set to %s, Expected: %s (%s - %s)",
+                wrapped_climate.target_temperature,
+                expected_temp,
+                min_temp,
+                max_temp,
+            )
+            if notify:
+                self._logic.notifications.async_notify(
+                    Issue.SAFETY_CHECK_DIFFERENCE,
+                    "Safety Check",
+                    f"""
+                        Safety check of {self._entity_id} failed: Temperature Difference mismatch.
+                        -> Current Temperature: {wrapped_climate.temperature}
+                        -> Target Temperature: {wrapped_climate.target_temperature}
+                        -> Should be: {expected_temp}
+                        Please check manually.""",
+                    self._entity_id,
+                )
+        elif notify:
+            self._logic.notifications.async_dismiss(
+                Issue.SAFETY_CHECK_DIFFERENCE, self._entity_id
+            )
+
+        return failed
@@ -0,0 +1,265 @@
+"""Weekly schedule of target temperatures for Climate Wrapper."""
+from __future__ import annotations
+
+from bisect import bisect_right
+from collections.abc import Callable
+from datetime import datetime, time, timedelta
+from typing import Any
+
+from homeassistant.const import WEEKDAYS
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_point_in_time
+from homeassistant.helpers.storage import Store
+import homeassistant.util.dt as dt_util
+
+from .const import DOMAIN
+from .trace import trace_control
+
+STORAGE_VERSION = 1
+
+DAY = 86400  # s
+WEEK = 7 * DAY
+
+
+class Timeline:
+    """A schedule compiled into sorted transitions.
+
+    Weekly blocks become transitions in seconds since Monday 00:00 local
+    time, override and holiday periods transitions at UTC timestamps. Each
+    transition holds its setpoint, None if nothing is scheduled, until the
+    next one. Overrides take precedence over holidays, holidays over the
+    weekly blocks, and later entries over earlier ones.
+    """
+
+    def __init__(self, config: dict[str, Any]) -> None:
+        """Compile the schedule."""
+        self.weekly_times, self.weekly_setpoints = _compile_weekly(
+            config.get("weekly", []), config.get("default")
+        )
+        self.period_times, self.period_setpoints = _compile_periods(
+            [*config.get("holidays", []), *config.get("overrides", [])]
+        )
+
+    def __len__(self) -> int:
+        """Return the number of transitions."""
+        return len(self.weekly_times) + len(self.period_times)
+
+    def setpoint(self, when: datetime) -> float | None:
+        """Return the setpoint active at when."""
+        index = bisect_right(self.period_times, when.timestamp()) - 1
+        if index >= 0 and (setpoint := self.period_setpoints[index]) is not None:
+            return setpoint
+
+        # Before the week's first transition, the last one still holds
+        index = bisect_right(self.weekly_times, _week_seconds(when)) - 1
+        return self.weekly_setpoints[index]
+
+    def next_transition(self, when: datetime) -> datetime | None:
+        """Return the first transition after when."""
+        transitions = []
+        index = bisect_right(self.period_times, when.timestamp())
+        if index < len(self.period_times):
+            transitions.append(dt_util.utc_from_timestamp(self.period_times[index]))
+        if len(self.weekly_times) > 1:
+            transitions.append(self._next_weekly_transition(when))
+        return min(transitions, default=None)
+
+    def _next_weekly_transition(self, when: datetime) -> datetime:
+        local = dt_util.as_local(when)
+        index = bisect_right(self.weekly_times, _week_seconds(local))
+        seconds = (
+            self.weekly_times[index]
+            if index < len(self.weekly_times)
+            else self.weekly_times[0] + WEEK
+        )
+
+        monday = local.date() - timedelta(days=local.weekday())
+        days, seconds = divmod(seconds, DAY)
+        point = dt_util.start_of_local_day(monday + timedelta(days=days)).replace(
+            hour=seconds // 3600, minute=seconds % 3600 // 60, second=seconds % 60
+        )
+        # The repeated hour when the clocks go back
+        if point <= when:
+            point = point.replace(fold=1)
+        return dt_util.as_utc(point)
+
+
+class WeeklySchedule:
+    """Apply an entry's schedule at its transitions.
+
+    Only the next transition is armed, with a single point in time listener
+    that re-arms itself once it fired. A setpoint is only applied when it
+    changes, so a manual target stays until the next effective transition.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        entry_id: str,
+        apply: Callable[[float], None],
+    ) -> None:
+        """Initialize the schedule."""
+        self._hass = hass
+        self._apply = apply
+        self._store: Store[dict[str, Any]] = Store(
+            hass, STORAGE_VERSION, storage_key(entry_id)
+        )
+        self.config: dict[str, Any] = {}
+        self.timeline = Timeline(self.config)
+        self.setpoint: float | None = None
+        self.next_transition: datetime | None = None
+        self._unsub_transition: CALLBACK_TYPE | None = None
+
+        # Statistics
+        self.transitions = 0
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the schedule's state."""
+        return {
+            "transitions": len(self.timeline),
+            "fired": self.transitions,
+            "setpoint": self.setpoint,
+            "next_transition": (
+                self.next_transition.isoformat() if self.next_transition else None
+            ),
+        }
+
+    async def async_load(self) -> None:
+        """Load the schedule and apply it."""
+        if (config := await self._store.async_load()) is not None:
+            self._async_compile(config)
+
+    async def async_set(self, config: dict[str, Any]) -> None:
+        """Replace the schedule and apply it right away."""
+        await self._store.async_save(config)
+        self.setpoint = None
+        self._async_compile(config)
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Disarm the next transition."""
+        if self._unsub_transition is not None:
+            self._unsub_transition()
+            self._unsub_transition = None
+
+    @callback
+    def _async_compile(self, config: dict[str, Any]) -> None:
+        self.config = config
+        self.timeline = Timeline(config)
+        self._async_update()
+
+    @callback
+    def _async_transition(self, _now: datetime) -> None:
+        self._unsub_transition = None
+        self.transitions += 1
+        self._async_update()
+
+    @callback
+    def _async_update(self) -> None:
+        """Apply the active setpoint and arm the next transition."""
+        self.async_shutdown()
+        now = dt_util.utcnow()
+
+        setpoint = self.timeline.setpoint(now)
+        if setpoint is not None and setpoint != self.setpoint:
+            trace_control("Schedule: Target Temperature %s", setpoint)
+            self._apply(setpoint)
+        self.setpoint = setpoint
+
+        self.next_transition = self.timeline.next_transition(now)
+        if self.next_transition is not None:
+            self._unsub_transition = async_track_point_in_time(
+                self._hass, self._async_transition, self.next_transition
+            )
+
+
+def storage_key(entry_id: str) -> str:
+    """Return the storage key of the schedule of an entry."""
+    return f"{DOMAIN}.{entry_id}.schedule"
+
+
+async def async_remove_schedule(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove the schedule of an entry."""
+    await Store(hass, STORAGE_VERSION, storage_key(entry_id)).async_remove()
+
+
+def _week_seconds(when: datetime) -> float:
+    local = dt_util.as_local(when)
+    return (
+        local.weekday() * DAY
+        + local.hour * 3600
+        + local.minute * 60
+        + local.second
+        + local.microsecond / 1e6
+    )
+
+
+def _day_seconds(value: str) -> int:
+    parsed = time.fromisoformat(value)
+    return parsed.hour * 3600 + parsed.minute * 60 + parsed.second
+
+
+def _compile_weekly(
+    blocks: list[dict[str, Any]], default: float | None
+) -> tuple[list[int], list[float | None]]:
+    intervals = []
+    for block in blocks:
+        start = _day_seconds(block["start"])
+        end = _day_seconds(block["end"])
+        if end <= start:
+            end += DAY  # Past midnight
+        for day in block["days"]:
+            offset = WEEKDAYS.index(day) * DAY
+            intervals.append((offset + start, offset + end, block["temperature"]))
+
+    # Blocks running past Sunday midnight continue on Monday
+    wrapped = []
+    for start, end, setpoint in intervals:
+        wrapped.append((start, min(end, WEEK), setpoint))
+        if end > WEEK:
+            wrapped.append((0, end - WEEK, setpoint))
+
+    boundaries = {0, *(start for start, _, _ in wrapped)}
+    boundaries.update(end for _, end, _ in wrapped if end < WEEK)
+    times, setpoints = _flatten(wrapped, default, boundaries)
+    # The week is a cycle, Monday 00:00 may continue Sunday's setpoint
+    if len(times) > 1 and setpoints[0] == setpoints[-1]:
+        del times[0], setpoints[0]
+    return times, setpoints
+
+
+def _compile_periods(
+    periods: list[dict[str, Any]]
+) -> tuple[list[float], list[float | None]]:
+    intervals = [
+        (
+            dt_util.parse_datetime(period["start"]).timestamp(),
+            dt_util.parse_datetime(period["end"]).timestamp(),
+            period["temperature"],
+        )
+        for period in periods
+    ]
+    boundaries = {start for start, _, _ in intervals}
+    boundaries.update(end for _, end, _ in intervals)
+    return _flatten(intervals, None, boundaries)
+
+
+def _flatten(
+    intervals: list[tuple[float, float, float]],
+    default: float | None,
+    boundaries: set[float],
+) -> tuple[list[float], list[float | None]]:
+    """Turn overlapping intervals into transitions, later intervals winning."""
+    times: list[float] = []
+    setpoints: list[float | None] = []
+    for boundary in sorted(boundaries):
+        setpoint = default
+        for start, end, value in intervals:
+            if start <= boundary < end:
+                setpoint = value
+        if setpoints and setpoints[-1] == setpoint:
+            continue
+        times.append(boundary)
+        setpoints.append(setpoint)
+    return times, setpoints
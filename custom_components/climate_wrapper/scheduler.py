@@ -0,0 +1,102 @@
+"""Coalescing update scheduler for Climate Wrapper."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Awaitable, Callable
+from datetime import datetime
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_call_later
+
+
+class UpdateScheduler:
+    """Merge bursts of update requests into single, serialized evaluations."""
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        update_method: Callable[[], Awaitable[None]],
+        debounce: float,
+    ) -> None:
+        """Initialize the scheduler."""
+        self._hass = hass
+        self._update_method = update_method
+        self.debounce = debounce
+
+        self._lock = asyncio.Lock()
+        self._unsub_timer: CALLBACK_TYPE | None = None
+        self._task: asyncio.Task | None = None
+        self._queued = False
+        self._shutdown = False
+
+        # Statistics
+        self.requested = 0
+        self.coalesced = 0
+        self.executed = 0
+
+    @callback
+    def async_schedule(self) -> None:
+        """Request an evaluation at the end of the debounce window."""
+        if self._shutdown:
+            return
+
+        self.requested += 1
+        if self._unsub_timer is not None or self._queued:
+            self.coalesced += 1
+            return
+
+        self._unsub_timer = async_call_later(
+            self._hass, self.debounce, self._async_timer_fired
+        )
+
+    async def async_refresh(self) -> None:
+        """Evaluate now, absorbing an evaluation that is already scheduled."""
+        if self._shutdown:
+            return
+
+        self.requested += 1
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+            self.coalesced += 1
+
+        await self._async_execute()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel pending and running evaluations."""
+        self._shutdown = True
+        if self._unsub_timer is not None:
+            self._unsub_timer()
+            self._unsub_timer = None
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """Return the scheduler counters."""
+        return {
+            "requested": self.requested,
+            "coalesced": self.coalesced,
+            "executed": self.executed,
+        }
+
+    @callback
+    def _async_timer_fired(self, _now: datetime) -> None:
+        self._unsub_timer = None
+        self._task = self._hass.async_create_task(self._async_execute())
+
+    async def _async_execute(self) -> None:
+        # An evaluation is already waiting for the lock and will see our changes
+        if self._queued:
+            self.coalesced += 1
+            async with self._lock:
+                return
+
+        self._queued = True
+        async with self._lock:
+            self._queued = False
+            if self._shutdown:
+                return
+            self.executed += 1
+            await self._update_method()
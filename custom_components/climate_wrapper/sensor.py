@@ -1,14 +1,18 @@
 """Platform for sensor integration."""
-import asyncio
+from collections import deque
+from typing import Any
 from homeassistant.components.sensor import SensorEntity
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later, async_track_point_in_time
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
-from datetime import datetime, date
+import homeassistant.util.dt as dt_util
+from datetime import datetime, date, timedelta
 
 
+from .entity import BatchedWriteEntity
 from .state import IntegrationState, SensorState
-from .const import DOMAIN
+from .const import DOMAIN, EXTERNAL_CHANGE_HISTORY, EXTERNAL_CHANGE_PULSE
 
 
 async def async_setup_entry(
@@ -20,7 +24,7 @@ async def async_setup_entry(
     async_add_entities([ClimateWrapperSensor(hass, config_entry.entry_id)], True)
 
 
-class ClimateWrapperSensor(SensorEntity):
+class ClimateWrapperSensor(BatchedWriteEntity, SensorEntity):
     """Representation of a Climate Wrapper Sensor."""
 
     def __init__(self, hass: HomeAssistant, entry_id: str):
@@ -33,17 +37,28 @@ class ClimateWrapperSensor(SensorEntity):
         self._data["sensor"] = self
 
         self._attr_name = (
-            f"Last external change of {self._data['conf']['wrapped_climate_id']}"
+            f"Last external change of {self._data['conf']['wrapped_climate_ids'][0]}"
         )
         self._attr_unique_id = (
             self._data["conf"]["friendly_name"].replace(" ", "_").lower()
         )
         self._attr_state: SensorState = SensorState.NORMAL
-        self._attr_state_attributes = {"last_changed": "never"}
 
         # Interal States
+        self._changes: deque[dict[str, Any]] = deque(maxlen=EXTERNAL_CHANGE_HISTORY)
+        self._changes_this_hour = 0
         self._changes_today = 0
-        self._last_reset = date.today()
+        self._last_changed: datetime | None = None
+        self._day: date | None = None
+        self._unsub_pulse: CALLBACK_TYPE | None = None
+        self._unsub_rollover: CALLBACK_TYPE | None = None
+
+    async def async_will_remove_from_hass(self):
+        """Cancel the pending timers."""
+        for unsub in (self._unsub_pulse, self._unsub_rollover):
+            if unsub is not None:
+                unsub()
+        self._unsub_pulse = self._unsub_rollover = None
 
     @property
     def name(self):
@@ -59,6 +74,11 @@ class ClimateWrapperSensor(SensorEntity):
     def should_poll(self):
         return False
 
+    @property
+    def available(self):
+        """Return True once the Logic is running."""
+        return self._data["logic"] is not None
+
     @property
     def state(self):
         """Return the state of the sensor."""
@@ -67,22 +87,64 @@ class ClimateWrapperSensor(SensorEntity):
     @property
     def state_attributes(self):
         """Return the state attributes of the sensor."""
-        return self._attr_state_attributes
-
-    async def external_change(self):
-        # Reset the counter if a new day has started
-        if date.today() > self._last_reset:
-            self._changes_today = 0
-            self._last_reset = date.today()
-
-        self._changes_today += 1
-        self._attr_state_attributes = {
-            "last_changed": datetime.now().strftime("%a @ %H:%M"),
+        if self._last_changed is None:
+            return {"last_changed": "never"}
+        return {
+            "last_changed": self._last_changed.strftime("%a @ %H:%M"),
+            "changes_this_hour": self._changes_this_hour,
             "changes_today": self._changes_today,
+            "recent_changes": list(self._changes),
         }
 
+    @callback
+    def async_external_change(self, entity_id: str, target_temperature: float):
+        """Record an external change of a wrapped climate and pulse the state."""
+        now = self._last_changed = dt_util.now()
+        self._changes.append(
+            {
+                "time": now.isoformat(timespec="seconds"),
+                "entity_id": entity_id,
+                "temperature": target_temperature,
+            }
+        )
+        self._changes_this_hour += 1
+        self._changes_today += 1
+        if self._unsub_rollover is None:
+            self._async_arm_rollover(now)
+
+        # A burst of changes extends the pulse instead of stacking up
+        if self._unsub_pulse is not None:
+            self._unsub_pulse()
+        self._unsub_pulse = async_call_later(
+            self._hass, EXTERNAL_CHANGE_PULSE, self._async_end_pulse
+        )
         self._attr_state = SensorState.EXTERNAL_CHANGE
-        self.async_write_ha_state()
-        await asyncio.sleep(1)
+        self.async_schedule_write()
+
+    @callback
+    def _async_end_pulse(self, _now: datetime):
+        self._unsub_pulse = None
         self._attr_state = SensorState.NORMAL
-        self.async_write_ha_state()
+        self.async_schedule_write()
+
+    @callback
+    def _async_arm_rollover(self, now: datetime):
+        """Reset the counters from the next full hour on."""
+        self._day = now.date()
+        next_hour = now.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+        self._unsub_rollover = async_track_point_in_time(
+            self._hass, self._async_rollover, next_hour
+        )
+
+    @callback
+    def _async_rollover(self, now: datetime):
+        self._unsub_rollover = None
+        now = dt_util.as_local(now)
+        self._changes_this_hour = 0
+        if now.date() != self._day:
+            self._changes_today = 0
+
+        # Only armed while there is a count left to reset
+        if self._changes_today:
+            self._async_arm_rollover(now)
+        self.async_schedule_write()
@@ -0,0 +1,299 @@
+"""Services of Climate Wrapper."""
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components.climate import ATTR_HVAC_MODE, HVACMode
+from homeassistant.const import (
+    ATTR_ENTITY_ID,
+    ATTR_TEMPERATURE,
+    ENTITY_MATCH_ALL,
+    WEEKDAYS,
+)
+from homeassistant.core import (
+    HomeAssistant,
+    ServiceCall,
+    ServiceResponse,
+    SupportsResponse,
+    callback,
+)
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.service import async_extract_referenced_entity_ids
+import homeassistant.util.dt as dt_util
+
+from .logic import Logic
+from .const import (
+    DOMAIN,
+    DECISION_LOG_QUERY_LIMIT,
+    SERVICE_GET_DECISIONS,
+    SERVICE_SET_MANY,
+    SERVICE_SET_SCHEDULE,
+    SERVICE_SET_TRACE_SAMPLING,
+    SET_MANY_CONCURRENCY,
+    SET_MANY_TIMEOUT,
+)
+from .trace import TRACERS, set_sampling
+
+ATTR_START = "start"
+ATTR_END = "end"
+ATTR_LIMIT = "limit"
+ATTR_CATEGORY = "category"
+ATTR_SAMPLE = "sample"
+ATTR_WEEKLY = "weekly"
+ATTR_DEFAULT = "default"
+ATTR_OVERRIDES = "overrides"
+ATTR_HOLIDAYS = "holidays"
+ATTR_DAYS = "days"
+
+GET_DECISIONS_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_START): cv.datetime,
+        vol.Optional(ATTR_END): cv.datetime,
+        vol.Optional(ATTR_LIMIT, default=DECISION_LOG_QUERY_LIMIT): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=DECISION_LOG_QUERY_LIMIT)
+        ),
+    }
+)
+
+SET_TRACE_SAMPLING_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_CATEGORY): vol.All(cv.ensure_list, [vol.In(TRACERS)]),
+        vol.Required(ATTR_SAMPLE): vol.All(vol.Coerce(int), vol.Range(min=1)),
+    }
+)
+
+
+WEEKLY_BLOCK_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_DAYS): vol.All(cv.ensure_list, [vol.In(WEEKDAYS)]),
+        vol.Required(ATTR_START): cv.time,
+        vol.Required(ATTR_END): cv.time,
+        vol.Required(ATTR_TEMPERATURE): vol.Coerce(float),
+    }
+)
+
+
+def _valid_period(period: dict[str, Any]) -> dict[str, Any]:
+    """Check that a period ends after it starts."""
+    if dt_util.as_utc(period[ATTR_END]) <= dt_util.as_utc(period[ATTR_START]):
+        raise vol.Invalid("end must be after start")
+    return period
+
+
+PERIOD_SCHEMA = vol.All(
+    vol.Schema(
+        {
+            vol.Required(ATTR_START): cv.datetime,
+            vol.Required(ATTR_END): cv.datetime,
+            vol.Required(ATTR_TEMPERATURE): vol.Coerce(float),
+        }
+    ),
+    _valid_period,
+)
+
+SET_SCHEDULE_SCHEMA = vol.Schema(
+    {
+        vol.Required(ATTR_ENTITY_ID): cv.entity_ids,
+        vol.Optional(ATTR_WEEKLY, default=[]): [WEEKLY_BLOCK_SCHEMA],
+        vol.Optional(ATTR_DEFAULT): vol.Coerce(float),
+        vol.Optional(ATTR_OVERRIDES, default=[]): [PERIOD_SCHEMA],
+        vol.Optional(ATTR_HOLIDAYS, default=[]): [PERIOD_SCHEMA],
+    }
+)
+
+
+SET_MANY_SCHEMA = vol.All(
+    cv.make_entity_service_schema(
+        {
+            vol.Optional(ATTR_TEMPERATURE): vol.Coerce(float),
+            vol.Optional(ATTR_HVAC_MODE): vol.All(
+                vol.Coerce(HVACMode),
+                vol.In([HVACMode.OFF, HVACMode.AUTO, HVACMode.HEAT]),
+            ),
+        }
+    ),
+    cv.has_at_least_one_key(ATTR_TEMPERATURE, ATTR_HVAC_MODE),
+)
+
+
+@callback
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Register the services of Climate Wrapper."""
+
+    async def async_get_decisions(call: ServiceCall) -> ServiceResponse:
+        """Return the logged decisions of wrapper climates within a time window."""
+        end = dt_util.as_utc(call.data.get(ATTR_END) or dt_util.utcnow())
+        start = dt_util.as_utc(call.data.get(ATTR_START) or end - timedelta(days=1))
+
+        response = {}
+        for entity_id in call.data[ATTR_ENTITY_ID]:
+            logic = _async_get_logic(hass, entity_id)
+            decisions = await logic.decision_log.async_query(
+                start, end, call.data[ATTR_LIMIT]
+            )
+            response[entity_id] = {
+                "decisions": [decision.as_dict() for decision in decisions]
+            }
+        return response
+
+    @callback
+    def async_set_trace_sampling(call: ServiceCall) -> None:
+        """Trace only every n-th message of the given categories."""
+        for category in call.data[ATTR_CATEGORY]:
+            set_sampling(category, call.data[ATTR_SAMPLE])
+
+    async def async_set_schedule(call: ServiceCall) -> None:
+        """Replace the schedule of wrapper climates."""
+        now = dt_util.utcnow()
+        config = {
+            ATTR_WEEKLY: [
+                {
+                    ATTR_DAYS: block[ATTR_DAYS],
+                    ATTR_START: block[ATTR_START].isoformat(),
+                    ATTR_END: block[ATTR_END].isoformat(),
+                    ATTR_TEMPERATURE: block[ATTR_TEMPERATURE],
+                }
+                for block in call.data[ATTR_WEEKLY]
+            ],
+            ATTR_DEFAULT: call.data.get(ATTR_DEFAULT),
+            # Periods that are already over are dropped
+            ATTR_OVERRIDES: _serialize_periods(call.data[ATTR_OVERRIDES], now),
+            ATTR_HOLIDAYS: _serialize_periods(call.data[ATTR_HOLIDAYS], now),
+        }
+        for entity_id in call.data[ATTR_ENTITY_ID]:
+            await _async_get_logic(hass, entity_id).schedule.async_set(config)
+
+    async def async_set_many(call: ServiceCall) -> ServiceResponse:
+        """Set the target and mode of many wrapper climates at once."""
+        selected = _async_get_selected_data(hass, call)
+
+        # Every state first, the valves follow
+        for data in selected.values():
+            if ATTR_TEMPERATURE in call.data:
+                data["state"].target_temperature = call.data[ATTR_TEMPERATURE]
+            if ATTR_HVAC_MODE in call.data:
+                data["state"].hvac_mode = call.data[ATTR_HVAC_MODE]
+            data["climate"].async_schedule_write()
+
+        # Not running yet, the Logic picks the state up once it starts
+        logics = {
+            entity_id: data["logic"]
+            for entity_id, data in selected.items()
+            if data["logic"] is not None
+        }
+        semaphore = asyncio.Semaphore(SET_MANY_CONCURRENCY)
+
+        # One deadline for the whole call; entries still waiting for their
+        # turn by then are commanded without waiting for the valves
+        expired = asyncio.Event()
+
+        @callback
+        def async_expire(_now: datetime) -> None:
+            expired.set()
+
+        unsub_expire = async_call_later(hass, SET_MANY_TIMEOUT, async_expire)
+
+        async def async_apply(logic: Logic) -> bool:
+            async with semaphore:
+                await logic.async_refresh()
+                wait = hass.async_create_task(logic.async_wait_acknowledged())
+                expire = hass.async_create_task(expired.wait())
+                await asyncio.wait({wait, expire}, return_when=asyncio.FIRST_COMPLETED)
+                wait.cancel()
+                expire.cancel()
+                return wait.done() and not wait.cancelled()
+
+        try:
+            acknowledged = await asyncio.gather(
+                *(async_apply(logic) for logic in logics.values())
+            )
+        finally:
+            unsub_expire()
+        acknowledged_by = dict(zip(logics, acknowledged))
+        return {
+            entity_id: {"acknowledged": acknowledged_by.get(entity_id, False)}
+            for entity_id in selected
+        }
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_MANY,
+        async_set_many,
+        schema=SET_MANY_SCHEMA,
+        supports_response=SupportsResponse.OPTIONAL,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_SCHEDULE,
+        async_set_schedule,
+        schema=SET_SCHEDULE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SET_TRACE_SAMPLING,
+        async_set_trace_sampling,
+        schema=SET_TRACE_SAMPLING_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_DECISIONS,
+        async_get_decisions,
+        schema=GET_DECISIONS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+
+
+@callback
+def _async_get_logic(hass: HomeAssistant, entity_id: str) -> Logic:
+    """Return the running Logic of the entry owning a wrapper climate."""
+    for data in hass.data.get(DOMAIN, {}).values():
+        climate = data["climate"]
+        if climate is not None and climate.entity_id == entity_id:
+            if data["logic"] is None:
+                raise HomeAssistantError(f"{entity_id} is not running yet")
+            return data["logic"]
+    raise HomeAssistantError(f"{entity_id} is not a Climate Wrapper climate")
+
+
+@callback
+def _async_get_selected_data(
+    hass: HomeAssistant, call: ServiceCall
+) -> dict[str, dict[str, Any]]:
+    """Return the data of the entries whose climates a call targets."""
+    entries = {
+        data["climate"].entity_id: data
+        for data in hass.data.get(DOMAIN, {}).values()
+        if data["climate"] is not None
+    }
+    if call.data.get(ATTR_ENTITY_ID) == ENTITY_MATCH_ALL:
+        return entries
+
+    selected = async_extract_referenced_entity_ids(hass, call)
+    entity_ids = selected.referenced | selected.indirectly_referenced
+    return {
+        entity_id: data
+        for entity_id, data in entries.items()
+        if entity_id in entity_ids
+    }
+
+
+def _serialize_periods(
+    periods: list[dict[str, Any]], now: datetime
+) -> list[dict[str, Any]]:
+    """Return the periods not yet over, with their times in UTC."""
+    return [
+        {
+            ATTR_START: dt_util.as_utc(period[ATTR_START]).isoformat(),
+            ATTR_END: dt_util.as_utc(period[ATTR_END]).isoformat(),
+            ATTR_TEMPERATURE: period[ATTR_TEMPERATURE],
+        }
+        for period in periods
+        if dt_util.as_utc(period[ATTR_END]) > now
+    ]
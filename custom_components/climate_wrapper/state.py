@@ -5,7 +5,7 @@ from homeassistant.components.climate.const import (
     ATTR_HVAC_ACTION,
     ATTR_CURRENT_TEMPERATURE,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, State
 from homeassistant.const import ATTR_TEMPERATURE
 
 from enum import StrEnum
@@ -25,8 +25,23 @@ class IntegrationState:
         return self.hvac_action == HVACAction.HEATING
 
 
+def _as_float(value, default: float) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return default
+
+
 class ClimateState:
-    _hass: HomeAssistant
+    """Immutable snapshot of a climate entity, parsed once from its State."""
+
+    __slots__ = (
+        "entity_id",
+        "hvac_mode",
+        "hvac_action",
+        "temperature",
+        "target_temperature",
+    )
 
     entity_id: str
     hvac_mode: HVACMode
@@ -34,29 +49,38 @@ class ClimateState:
     temperature: float
     target_temperature: float
 
-    def __init__(self, hass: HomeAssistant, entity_id: str) -> None:
-        self._hass = hass
-        self.entity_id = entity_id
-
-    @property
-    def state(self):
-        return self._hass.states.get(self.entity_id)
-
-    @property
-    def hvac_mode(self):
-        return self.state.state
-
-    @property
-    def hvac_action(self):
-        return self.state.attributes.get(ATTR_HVAC_ACTION)
-
-    @property
-    def temperature(self):
-        return float(self.state.attributes.get(ATTR_CURRENT_TEMPERATURE, 5))
-
-    @property
-    def target_temperature(self):
-        return float(self.state.attributes.get(ATTR_TEMPERATURE, 0))
+    def __init__(self, state: State) -> None:
+        """Take a snapshot of state."""
+        attributes = state.attributes
+        object.__setattr__(self, "entity_id", state.entity_id)
+        object.__setattr__(self, "hvac_mode", state.state)
+        object.__setattr__(self, "hvac_action", attributes.get(ATTR_HVAC_ACTION))
+        object.__setattr__(
+            self,
+            "temperature",
+            _as_float(attributes.get(ATTR_CURRENT_TEMPERATURE, 5), 5),
+        )
+        object.__setattr__(
+            self,
+            "target_temperature",
+            _as_float(attributes.get(ATTR_TEMPERATURE, 0), 0),
+        )
+
+    def __setattr__(self, name, value):
+        """Refuse to change the snapshot."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __delattr__(self, name):
+        """Refuse to change the snapshot."""
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    @classmethod
+    def from_hass(cls, hass: HomeAssistant, entity_id: str) -> "ClimateState | None":
+        """Take a snapshot of the current state of entity_id."""
+        state = hass.states.get(entity_id)
+        if state is None:
+            return None
+        return cls(state)
 
     @property
     def difference(self):
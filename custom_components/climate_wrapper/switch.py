@@ -1,11 +1,14 @@
 """Platform for switch integration."""
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.core import HomeAssistant
+from homeassistant.const import STATE_OFF
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.restore_state import RestoreEntity
 from homeassistant.helpers.typing import ConfigType, DiscoveryInfoType
 from datetime import datetime, date
 
 
+from .entity import BatchedWriteEntity
 from .state import IntegrationState
 from .const import DOMAIN
 
@@ -19,7 +22,7 @@ async def async_setup_entry(
     async_add_entities([CustomSwitch(hass, config_entry.entry_id)], True)
 
 
-class CustomSwitch(SwitchEntity):
+class CustomSwitch(BatchedWriteEntity, SwitchEntity, RestoreEntity):
     """Representation of a Custom Switch."""
 
     def __init__(self, hass: HomeAssistant, entry_id: str):
@@ -32,12 +35,18 @@ class CustomSwitch(SwitchEntity):
         self._data["switch"] = self
 
         self._attr_name = (
-            f"Enable Wrapper for {self._data['conf']['wrapped_climate_id']}"
+            f"Enable Wrapper for {self._data['conf']['wrapped_climate_ids'][0]}"
         )
         self._attr_unique_id = (
             f"enable_{self._data['conf']['friendly_name'].replace(' ', '_').lower()}"
         )
 
+    async def async_added_to_hass(self):
+        """Restore the switch state from before the restart."""
+        await super().async_added_to_hass()
+        if (last_state := await self.async_get_last_state()) is not None:
+            self._state.enable = last_state.state != STATE_OFF
+
     @property
     def name(self):
         """Return the name of the switch."""
@@ -48,6 +57,11 @@ class CustomSwitch(SwitchEntity):
         """Return a unique ID."""
         return self._attr_unique_id
 
+    @property
+    def available(self):
+        """Return True once the Logic is running."""
+        return self._data["logic"] is not None
+
     @property
     def is_on(self):
         """Return the state of the switch."""
@@ -56,10 +70,10 @@ class CustomSwitch(SwitchEntity):
     async def async_turn_on(self, **kwargs):
         """Turn the switch on."""
         self._state.enable = True
-        await self._data["logic"].update()
-        self.async_write_ha_state()
+        await self._data["logic"].async_refresh()
+        self.async_schedule_write()
 
     async def async_turn_off(self, **kwargs):
         """Turn the switch off."""
         self._state.enable = False
-        self.async_write_ha_state()
+        self.async_schedule_write()
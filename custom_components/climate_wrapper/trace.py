@@ -0,0 +1,77 @@
+"""Lazily evaluated debug tracing, enabled and sampled per category.
+
+Each category logs to its own child logger, so categories are enabled
+through the regular logger configuration, e.g.
+
+    logger:
+      logs:
+        custom_components.climate_wrapper.trace.sensor: debug
+
+Messages use %-style arguments, which are only formatted once a record is
+actually emitted. While a category is disabled a trace call costs one
+cached level check.
+"""
+from __future__ import annotations
+
+import logging
+from typing import Any
+
+TRACE_LOGGER = f"{__package__}.trace"
+
+CATEGORY_CLIMATE = "climate"
+CATEGORY_SENSOR = "sensor"
+CATEGORY_CONTROL = "control"
+CATEGORY_COMMAND = "command"
+CATEGORY_SAFETY = "safety"
+
+
+class Tracer:
+    """Debug trace of one category, emitting every sample-th message."""
+
+    __slots__ = ("category", "logger", "sample", "_skipped")
+
+    def __init__(self, category: str, sample: int = 1) -> None:
+        """Initialize the tracer."""
+        self.category = category
+        self.logger = logging.getLogger(f"{TRACE_LOGGER}.{category}")
+        self.sample = sample
+        self._skipped = 0
+
+    @property
+    def enabled(self) -> bool:
+        """Return True if the category is traced, to guard costly arguments."""
+        return self.logger.isEnabledFor(logging.DEBUG)
+
+    def __call__(self, msg: str, *args: Any) -> None:
+        """Trace a message."""
+        if not self.logger.isEnabledFor(logging.DEBUG):
+            return
+        if self.sample > 1:
+            self._skipped += 1
+            if self._skipped < self.sample:
+                return
+            self._skipped = 0
+        self.logger.debug(msg, *args, stacklevel=2)
+
+
+TRACERS: dict[str, Tracer] = {
+    category: Tracer(category)
+    for category in (
+        CATEGORY_CLIMATE,
+        CATEGORY_SENSOR,
+        CATEGORY_CONTROL,
+        CATEGORY_COMMAND,
+        CATEGORY_SAFETY,
+    )
+}
+
+trace_climate = TRACERS[CATEGORY_CLIMATE]
+trace_sensor = TRACERS[CATEGORY_SENSOR]
+trace_control = TRACERS[CATEGORY_CONTROL]
+trace_command = TRACERS[CATEGORY_COMMAND]
+trace_safety = TRACERS[CATEGORY_SAFETY]
+
+
+def set_sampling(category: str, sample: int) -> None:
+    """Emit only every sample-th message of a category."""
+    TRACERS[category].sample = max(sample, 1)
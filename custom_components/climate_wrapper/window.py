@@ -0,0 +1,173 @@
+"""Open window detection for Climate Wrapper."""
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Callable
+from datetime import datetime
+from typing import Any
+
+from homeassistant.const import STATE_ON
+from homeassistant.core import CALLBACK_TYPE, State, callback
+
+from .coordinator import ClimateWrapperCoordinator
+from .trace import trace_control
+from .const import WINDOW_MIN_SAMPLES, WINDOW_SLOPE_PERIOD
+
+
+class SlopeWindow:
+    """Least-squares slope of the samples within a sliding time window.
+
+    The regression sums are updated as samples enter and leave the window,
+    so each sample costs O(1) amortized. Times enter the sums relative to the
+    oldest sample in the window, which keeps the sums small.
+    """
+
+    def __init__(self, period: float) -> None:
+        """Initialize the window of period seconds."""
+        self.period = period
+        self._samples: deque[tuple[float, float]] = deque()
+        self._origin = 0.0
+        self._sum_x = self._sum_y = self._sum_xx = self._sum_xy = 0.0
+
+    def __len__(self) -> int:
+        """Return the number of samples in the window."""
+        return len(self._samples)
+
+    def add(self, value: float, when: float) -> None:
+        """Add a sample taken at the timestamp when."""
+        if not self._samples:
+            self._origin = when
+            self._sum_x = self._sum_y = self._sum_xx = self._sum_xy = 0.0
+
+        x = when - self._origin
+        self._samples.append((when, value))
+        self._sum_x += x
+        self._sum_y += value
+        self._sum_xx += x * x
+        self._sum_xy += x * value
+
+        # Drop what fell out of the window
+        if when - self._samples[0][0] <= self.period:
+            return
+        while when - self._samples[0][0] > self.period:
+            old_when, old_value = self._samples.popleft()
+            old_x = old_when - self._origin
+            self._sum_x -= old_x
+            self._sum_y -= old_value
+            self._sum_xx -= old_x * old_x
+            self._sum_xy -= old_x * old_value
+
+        # Re-base the sums on the new oldest sample
+        shift = self._samples[0][0] - self._origin
+        count = len(self._samples)
+        self._origin += shift
+        self._sum_xx += shift * (count * shift - 2 * self._sum_x)
+        self._sum_xy -= shift * self._sum_y
+        self._sum_x -= count * shift
+
+    @property
+    def span(self) -> float:
+        """Return the seconds between the oldest and newest sample."""
+        if not self._samples:
+            return 0.0
+        return self._samples[-1][0] - self._samples[0][0]
+
+    @property
+    def slope(self) -> float | None:
+        """Return the slope in units per second, None without enough samples."""
+        count = len(self._samples)
+        denominator = count * self._sum_xx - self._sum_x * self._sum_x
+        if count < 2 or denominator <= 0:
+            return None
+        return (count * self._sum_xy - self._sum_x * self._sum_y) / denominator
+
+
+class WindowDetector:
+    """Pause the control loop while a window is open.
+
+    A window counts as open for pause minutes once the room cools faster
+    than threshold °C/min over WINDOW_SLOPE_PERIOD, or for as long as the
+    optional contact sensor reports it open.
+    """
+
+    def __init__(
+        self,
+        coordinator: ClimateWrapperCoordinator,
+        threshold: float,
+        pause: float,
+        on_change: Callable[[], None],
+    ) -> None:
+        """Initialize the detector."""
+        self._coordinator = coordinator
+        self.threshold = threshold
+        self.pause = pause
+        self._on_change = on_change
+        self._slope = SlopeWindow(WINDOW_SLOPE_PERIOD)
+        self._paused = False
+        self._contact_open = False
+        self._unsub_pause: CALLBACK_TYPE | None = None
+
+        # Statistics
+        self.detections = 0
+
+    @property
+    def open(self) -> bool:
+        """Return True while control is paused for an open window."""
+        return self._paused or self._contact_open
+
+    @property
+    def stats(self) -> dict[str, Any]:
+        """Return the detector's state."""
+        slope = self._slope.slope
+        return {
+            "open": self.open,
+            "contact_open": self._contact_open,
+            "detections": self.detections,
+            "slope": None if slope is None else round(slope * 60, 4),
+        }
+
+    @callback
+    def async_add_sample(self, temperature: float, when: datetime) -> None:
+        """Add a temperature sample and pause if the room cools too fast."""
+        if not self.threshold:
+            return
+        self._slope.add(temperature, when.timestamp())
+        if (
+            self._paused
+            or len(self._slope) < WINDOW_MIN_SAMPLES
+            or self._slope.span < WINDOW_SLOPE_PERIOD / 2
+            or (slope := self._slope.slope) is None
+            or slope * 60 > -self.threshold
+        ):
+            return
+
+        trace_control("Open window detected, cooling at %.3f °C/min", slope * 60)
+        self.detections += 1
+        self._paused = True
+        self._unsub_pause = self._coordinator.async_schedule_deadline(
+            self.pause * 60, self._async_pause_expired
+        )
+        self._on_change()
+
+    @callback
+    def async_update_contact(self, state: State | None) -> None:
+        """Follow the state of the window contact sensor."""
+        contact_open = state is not None and state.state == STATE_ON
+        if contact_open == self._contact_open:
+            return
+        trace_control("Window contact %s", "opened" if contact_open else "closed")
+        self._contact_open = contact_open
+        self._on_change()
+
+    @callback
+    def async_shutdown(self) -> None:
+        """Cancel the pending end of a pause."""
+        if self._unsub_pause is not None:
+            self._unsub_pause()
+            self._unsub_pause = None
+
+    @callback
+    def _async_pause_expired(self) -> None:
+        self._unsub_pause = None
+        self._paused = False
+        self._on_change()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""Benchmark the cost of debug tracing per control loop event.
+
+Compares the eager f-string debug logging the control loop used before with
+the lazy tracers of custom_components/climate_wrapper/trace.py: with tracing
+disabled (the production case), enabled, and enabled with 1 in 10 sampled.
+Enabled records go to a NullHandler, so output costs are not included.
+
+Usage:
+    python scripts/benchmark_trace.py --number 200000
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+from pathlib import Path
+import sys
+import timeit
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.climate_wrapper.trace import (  # noqa: E402
+    TRACE_LOGGER,
+    TRACERS,
+    set_sampling,
+    trace_control,
+    trace_sensor,
+)
+
+_LOGGER = logging.getLogger("custom_components.climate_wrapper.logic")
+
+
+def eager_event(temperature: float, target: float, low: float, high: float) -> None:
+    """Debug logging of one sensor event and evaluation, formatted eagerly."""
+    _LOGGER.debug(f"Receiving new current Temperature: {temperature}")
+    _LOGGER.debug(
+        f"Setting Wrapped Climate Target Temperature to {target}. Current: {temperature}, Expected Min: {low}, Expected Max: {high}"
+    )
+
+
+def lazy_event(temperature: float, target: float, low: float, high: float) -> None:
+    """Tracing of one sensor event and evaluation, formatted lazily."""
+    trace_sensor("Receiving new current Temperature: %s", temperature)
+    trace_control(
+        "Setting Wrapped Climate Target Temperature to %s. Current: %s, Expected Min: %s, Expected Max: %s",
+        target,
+        temperature,
+        low,
+        high,
+    )
+
+
+def _measure(function, number: int) -> float:
+    """Return the best time per call of function, in ns."""
+    timer = timeit.Timer(lambda: function(20.25, 21.0, 21.0, 30.0))
+    return min(timer.repeat(repeat=5, number=number)) / number * 1e9
+
+
+def main() -> None:
+    """Run the benchmark and print the results."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+
+    package = logging.getLogger("custom_components.climate_wrapper")
+    package.addHandler(logging.NullHandler())
+    package.propagate = False
+
+    rows = []
+    for label, level, sample in (
+        ("disabled", logging.INFO, 1),
+        ("enabled", logging.DEBUG, 1),
+        ("1 in 10", logging.DEBUG, 10),
+    ):
+        package.setLevel(level)
+        logging.getLogger(TRACE_LOGGER).setLevel(level)
+        for category in TRACERS:
+            set_sampling(category, sample)
+        rows.append(
+            (
+                label,
+                _measure(eager_event, args.number),
+                _measure(lazy_event, args.number),
+            )
+        )
+
+    lines = [f"{'debug':10} {'eager (ns)':>12} {'lazy (ns)':>12} {'speedup':>8}"]
+    for label, eager, lazy in rows:
+        lines.append(f"{label:10} {eager:12.0f} {lazy:12.0f} {eager / lazy:7.1f}x")
+    print("\n".join(lines))  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
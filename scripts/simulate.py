@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""Offline simulation and benchmark of the Climate Wrapper control loop.
+
+Runs the integration's Logic inside a headless Home Assistant core against a
+simulated TRV and a thermal model of a room and its radiator. The event loop
+runs on a virtual clock, so days of operation take seconds. The temperature
+sensor is either derived from the room model or replayed from a recorded
+trace (a CSV with a timestamp and a temperature column, e.g. a history
+export of the sensor).
+
+Usage:
+    python scripts/simulate.py --days 7 --control-mode predictive
+    python scripts/simulate.py --trace sensor.csv --update-debounce 10
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import csv
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+import logging
+from pathlib import Path
+import random
+import selectors
+import shutil
+import sys
+import tempfile
+import time
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from homeassistant.components.climate.const import (  # noqa: E402
+    ATTR_CURRENT_TEMPERATURE,
+    ATTR_HVAC_ACTION,
+    DOMAIN as DOMAIN_CLIMATE,
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+    HVACAction,
+    HVACMode,
+)
+from homeassistant.const import ATTR_TEMPERATURE, CONF_FRIENDLY_NAME  # noqa: E402
+from homeassistant.core import CoreState, HomeAssistant, ServiceCall  # noqa: E402
+import homeassistant.helpers.event as event_helper  # noqa: E402
+import homeassistant.util.dt as dt_util  # noqa: E402
+
+from custom_components.climate_wrapper import async_init_entry_data  # noqa: E402
+from custom_components.climate_wrapper.const import (  # noqa: E402
+    CONF_CONTROL_MODE,
+    CONF_FILTER_MAX_RATE,
+    CONF_FILTER_THRESHOLD,
+    CONF_MIN_IDLE_TIME,
+    CONF_MIN_RUN_TIME,
+    CONF_PREDICTIVE_LOOKAHEAD,
+    CONF_SENSOR_FILTER,
+    CONF_TEMPERATURE_SENSOR,
+    CONF_TEMPERATURE_VARIANCE,
+    CONF_UPDATE_DEBOUNCE,
+    CONF_WINDOW_PAUSE,
+    CONF_WINDOW_THRESHOLD,
+    CONF_WRAPPED_CLIMATE,
+    CONTROL_MODE_HYSTERESIS,
+    CONTROL_MODE_PREDICTIVE,
+    DEFAULT_FILTER_MAX_RATE,
+    DEFAULT_FILTER_THRESHOLD,
+    DEFAULT_MIN_IDLE_TIME,
+    DEFAULT_MIN_RUN_TIME,
+    DEFAULT_PREDICTIVE_LOOKAHEAD,
+    DEFAULT_UPDATE_DEBOUNCE,
+    DEFAULT_WINDOW_PAUSE,
+    DEFAULT_WINDOW_THRESHOLD,
+    FILTER_EMA,
+    FILTER_MEDIAN,
+    FILTER_NONE,
+)
+from custom_components.climate_wrapper.logic import Logic  # noqa: E402
+
+CLIMATE_ID = "climate.simulated_trv"
+SENSOR_ID = "sensor.simulated_room_temperature"
+START = datetime(2024, 1, 1, tzinfo=UTC)
+STEP = 10.0  # Physics step, in s
+
+
+#
+# Virtual Clock
+#
+
+
+class _VirtualSelector(selectors.DefaultSelector):
+    """Selector that skips idle time instead of waiting for it."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.now = 0.0
+        self.executor_jobs = 0
+
+    def select(self, timeout=None):
+        events = super().select(0)
+        if events or timeout == 0:
+            return events
+        if timeout is None or self.executor_jobs:
+            # Executor jobs run in real time, wait for them to report back
+            return super().select(None)
+        self.now += timeout
+        return []
+
+
+class VirtualClockLoop(asyncio.SelectorEventLoop):
+    """Event loop whose clock only advances when the loop would be idle."""
+
+    def __init__(self) -> None:
+        """Initialize the loop at virtual time 0."""
+        self._virtual_selector = _VirtualSelector()
+        super().__init__(self._virtual_selector)
+
+    def time(self) -> float:
+        """Return the virtual time."""
+        return self._virtual_selector.now
+
+    def run_in_executor(self, executor, func, *args):
+        """Run func in the executor, holding the virtual clock meanwhile."""
+        future = super().run_in_executor(executor, func, *args)
+        self._virtual_selector.executor_jobs += 1
+        future.add_done_callback(self._async_executor_job_done)
+        return future
+
+    def _async_executor_job_done(self, _future: asyncio.Future) -> None:
+        self._virtual_selector.executor_jobs -= 1
+
+
+def _patch_wall_clock(loop: VirtualClockLoop) -> None:
+    """Make Home Assistant's wall clock follow the virtual clock."""
+    start = START.timestamp()
+
+    def timestamp() -> float:
+        return start + loop.time()
+
+    def utcnow() -> datetime:
+        return datetime.fromtimestamp(timestamp(), UTC)
+
+    time.time = timestamp
+    dt_util.utcnow = utcnow
+    event_helper.time_tracker_timestamp = timestamp
+    event_helper.time_tracker_utcnow = utcnow
+
+
+#
+# Room and Device
+#
+
+
+@dataclass
+class Room:
+    """Two-node thermal model of a room and its radiator, in °C and minutes."""
+
+    outdoor: float
+    temperature: float = 18.0
+    radiator: float = 18.0
+    valve: float = 0.0  # Opening, 0..1
+
+    supply: float = 55.0
+    heat_up: float = 0.05  # Radiator towards supply, per minute and opening
+    emission: float = 0.02  # Radiator towards room, per minute
+    coupling: float = 0.01  # Room towards radiator, per minute
+    loss: float = 0.002  # Room towards outdoor, per minute
+
+    def step(self, minutes: float) -> None:
+        """Advance the model by minutes."""
+        radiator_delta = (
+            self.valve * self.heat_up * (self.supply - self.radiator)
+            - self.emission * (self.radiator - self.temperature)
+        ) * minutes
+        room_delta = (
+            self.coupling * (self.radiator - self.temperature)
+            - self.loss * (self.temperature - self.outdoor)
+        ) * minutes
+        self.radiator += radiator_delta
+        self.temperature += room_delta
+
+    @property
+    def at_valve(self) -> float:
+        """Return the temperature measured by the TRV, next to the radiator."""
+        return self.temperature + 0.3 * (self.radiator - self.temperature)
+
+
+@dataclass
+class Trv:
+    """Simulated thermostatic radiator valve, exposed as a climate entity."""
+
+    hass: HomeAssistant
+    room: Room
+    latency: float
+    report_interval: float
+
+    hvac_mode: str = HVACMode.HEAT
+    target: float = 20.0
+    valve_cycles: int = 0
+    service_calls: dict[str, int] = field(default_factory=dict)
+    _last_report: float = -1e9
+
+    def register(self) -> None:
+        """Register the climate services of the device."""
+        for service in (SERVICE_SET_HVAC_MODE, SERVICE_SET_TEMPERATURE):
+            self.hass.services.async_register(
+                DOMAIN_CLIMATE, service, self._async_handle
+            )
+
+    async def _async_handle(self, call: ServiceCall) -> None:
+        self.service_calls[call.service] = self.service_calls.get(call.service, 0) + 1
+        # Sent, the device confirms it on its next radio contact
+        self.hass.async_create_task(self._async_apply(call))
+
+    async def _async_apply(self, call: ServiceCall) -> None:
+        await asyncio.sleep(self.latency)
+        if call.service == SERVICE_SET_HVAC_MODE:
+            self.hvac_mode = call.data["hvac_mode"]
+        else:
+            self.target = call.data[ATTR_TEMPERATURE]
+        self.report()
+
+    def step(self) -> None:
+        """Open or close the valve and report periodically."""
+        opening = float(
+            self.hvac_mode == HVACMode.HEAT and self.room.at_valve < self.target
+        )
+        if opening and not self.room.valve:
+            self.valve_cycles += 1
+        self.room.valve = opening
+
+        if self.hass.loop.time() - self._last_report >= self.report_interval:
+            self.report()
+
+    def report(self) -> None:
+        """Publish the state of the device."""
+        self._last_report = self.hass.loop.time()
+        self.hass.states.async_set(
+            CLIMATE_ID,
+            self.hvac_mode,
+            {
+                ATTR_CURRENT_TEMPERATURE: round(self.room.at_valve, 1),
+                ATTR_TEMPERATURE: self.target,
+                ATTR_HVAC_ACTION: (
+                    HVACAction.HEATING if self.room.valve else HVACAction.IDLE
+                ),
+            },
+        )
+
+
+class _Entity:
+    """Stand-in for the wrapper's own entities."""
+
+    def async_schedule_write(self) -> None:
+        pass
+
+    def async_external_change(self, entity_id: str, target: float) -> None:
+        pass
+
+
+#
+# Sensor Input
+#
+
+
+def load_trace(path: str) -> list[tuple[float, float]]:
+    """Read (seconds since the first sample, temperature) pairs from a CSV."""
+    samples = []
+    with open(path, newline="", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            when = row.get("last_changed") or row.get("timestamp") or row["time"]
+            value = row.get("state") or row.get("temperature") or row["value"]
+            try:
+                temperature = float(value)
+            except ValueError:
+                continue
+            try:
+                seconds = float(when)
+            except ValueError:
+                seconds = dt_util.parse_datetime(when).timestamp()
+            samples.append((seconds, temperature))
+
+    samples.sort()
+    if not samples:
+        raise SystemExit(f"No temperature samples in {path}")
+    return [(seconds - samples[0][0], value) for seconds, value in samples]
+
+
+#
+# Simulation
+#
+
+
+@dataclass
+class Report:
+    """Results of a simulation run."""
+
+    days: float = 0.0
+    wall_time: float = 0.0
+    evaluations: int = 0
+    service_calls: dict[str, int] = field(default_factory=dict)
+    commands: dict[str, int] = field(default_factory=dict)
+    wrapper_cycles: int = 0
+    valve_cycles: int = 0
+    max_overshoot: float = 0.0
+    overshoot_degree_hours: float = 0.0
+    undershoot_degree_hours: float = 0.0
+    mean_temperature: float = 0.0
+
+    def __str__(self) -> str:
+        """Return the report as aligned lines of text."""
+        rows = [
+            ("Simulated days", f"{self.days:.2f}"),
+            ("Wall time", f"{self.wall_time:.2f} s"),
+            ("Evaluations", f"{self.evaluations}"),
+            (
+                "Evaluations per second",
+                f"{self.evaluations / max(self.wall_time, 1e-9):.0f}",
+            ),
+            ("Service calls sent", f"{sum(self.service_calls.values())}"),
+            *(
+                (f"  {service}", f"{count}")
+                for service, count in sorted(self.service_calls.items())
+            ),
+            ("Commands suppressed", f"{self.commands.get('suppressed', 0)}"),
+            ("Commands expired", f"{self.commands.get('expired', 0)}"),
+            ("Relay cycles per day", f"{self.wrapper_cycles / self.days:.1f}"),
+            ("Valve cycles per day", f"{self.valve_cycles / self.days:.1f}"),
+            ("Mean room temperature", f"{self.mean_temperature:.2f} °C"),
+            ("Max overshoot", f"{self.max_overshoot:.2f} °C"),
+            ("Overshoot", f"{self.overshoot_degree_hours:.2f} °C·h"),
+            ("Undershoot", f"{self.undershoot_degree_hours:.2f} °C·h"),
+        ]
+        return "\n".join(f"{label + ':':26} {value}" for label, value in rows)
+
+
+async def async_simulate(args: argparse.Namespace) -> Report:
+    """Run one simulation."""
+    loop = asyncio.get_running_loop()
+    _patch_wall_clock(loop)
+    rng = random.Random(args.seed)
+
+    hass = HomeAssistant()
+    hass.config.config_dir = tempfile.mkdtemp(prefix="climate_wrapper_sim_")
+    hass.state = CoreState.running
+
+    trace = load_trace(args.trace) if args.trace else None
+    duration = trace[-1][0] if trace else args.days * 86400
+
+    room = Room(outdoor=args.outdoor, temperature=trace[0][1] if trace else 18.0)
+    room.radiator = room.temperature
+    trv = Trv(hass, room, args.trv_latency, args.trv_report * 60)
+    trv.register()
+    trv.report()
+    hass.states.async_set(SENSOR_ID, round(room.temperature, 2))
+
+    entry = SimpleNamespace(
+        entry_id="simulation",
+        data={
+            CONF_FRIENDLY_NAME: "Simulation",
+            CONF_WRAPPED_CLIMATE: [CLIMATE_ID],
+            CONF_TEMPERATURE_SENSOR: [SENSOR_ID],
+            CONF_TEMPERATURE_VARIANCE: args.variance,
+            CONF_UPDATE_DEBOUNCE: args.update_debounce,
+            CONF_CONTROL_MODE: args.control_mode,
+            CONF_PREDICTIVE_LOOKAHEAD: args.predictive_lookahead,
+            CONF_SENSOR_FILTER: args.sensor_filter,
+            CONF_FILTER_MAX_RATE: args.filter_max_rate,
+            CONF_FILTER_THRESHOLD: args.filter_threshold,
+            CONF_MIN_RUN_TIME: args.min_run_time,
+            CONF_MIN_IDLE_TIME: args.min_idle_time,
+            CONF_WINDOW_THRESHOLD: args.window_threshold,
+            CONF_WINDOW_PAUSE: args.window_pause,
+        },
+        options={},
+    )
+    data = async_init_entry_data(hass, entry)
+    data["state"].target_temperature = args.target
+    data["climate"] = data["sensor"] = data["switch"] = _Entity()
+
+    logic = Logic(hass, entry)
+    await logic.async_setup()
+
+    report = Report(days=duration / 86400)
+    upper = args.target + args.variance
+    lower = args.target - args.variance
+    heating = data["state"].heating
+    next_sample = 0
+    temperature_sum = 0.0
+    steps = 0
+    started = time.perf_counter()
+
+    while loop.time() < duration:
+        await asyncio.sleep(STEP)
+        now = loop.time()
+        room.step(STEP / 60)
+
+        # Sensor input
+        if trace is not None:
+            while next_sample < len(trace) and trace[next_sample][0] <= now:
+                room.temperature = trace[next_sample][1]
+                hass.states.async_set(SENSOR_ID, room.temperature)
+                next_sample += 1
+        elif now % args.sensor_interval < STEP:
+            value = room.temperature + rng.gauss(0, args.sensor_noise)
+            hass.states.async_set(SENSOR_ID, round(value, 2))
+
+        trv.step()
+
+        # Comfort and cycling
+        if data["state"].heating and not heating:
+            report.wrapper_cycles += 1
+        heating = data["state"].heating
+        report.max_overshoot = max(report.max_overshoot, room.temperature - upper)
+        report.overshoot_degree_hours += max(room.temperature - upper, 0) * STEP / 3600
+        report.undershoot_degree_hours += max(lower - room.temperature, 0) * STEP / 3600
+        temperature_sum += room.temperature
+        steps += 1
+
+    report.wall_time = time.perf_counter() - started
+    report.evaluations = logic.metrics.updates.total
+    report.service_calls = trv.service_calls
+    report.commands = logic.command_stats
+    report.valve_cycles = trv.valve_cycles
+    report.mean_temperature = temperature_sum / max(steps, 1)
+
+    for cancel_callback in data["callbacks"]:
+        cancel_callback()
+    await hass.async_stop(force=True)
+    shutil.rmtree(hass.config.config_dir, ignore_errors=True)
+    return report
+
+
+def main() -> None:
+    """Parse the arguments, simulate and print the report."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--days", type=float, default=7, help="simulated days")
+    parser.add_argument("--trace", help="CSV of recorded sensor samples to replay")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--target", type=float, default=20.0, help="°C")
+    parser.add_argument("--variance", type=float, default=0.5, help="°C")
+    parser.add_argument(
+        "--control-mode",
+        choices=[CONTROL_MODE_HYSTERESIS, CONTROL_MODE_PREDICTIVE],
+        default=CONTROL_MODE_HYSTERESIS,
+    )
+    parser.add_argument(
+        "--predictive-lookahead",
+        type=float,
+        default=DEFAULT_PREDICTIVE_LOOKAHEAD,
+        help="min",
+    )
+    parser.add_argument(
+        "--update-debounce", type=float, default=DEFAULT_UPDATE_DEBOUNCE, help="s"
+    )
+    parser.add_argument(
+        "--sensor-filter",
+        choices=[FILTER_NONE, FILTER_EMA, FILTER_MEDIAN],
+        default=FILTER_NONE,
+    )
+    parser.add_argument(
+        "--filter-max-rate",
+        type=float,
+        default=DEFAULT_FILTER_MAX_RATE,
+        help="°C/min",
+    )
+    parser.add_argument(
+        "--filter-threshold", type=float, default=DEFAULT_FILTER_THRESHOLD, help="°C"
+    )
+    parser.add_argument(
+        "--min-run-time", type=float, default=DEFAULT_MIN_RUN_TIME, help="min"
+    )
+    parser.add_argument(
+        "--min-idle-time", type=float, default=DEFAULT_MIN_IDLE_TIME, help="min"
+    )
+    parser.add_argument(
+        "--window-threshold",
+        type=float,
+        default=DEFAULT_WINDOW_THRESHOLD,
+        help="°C/min",
+    )
+    parser.add_argument(
+        "--window-pause", type=float, default=DEFAULT_WINDOW_PAUSE, help="min"
+    )
+    parser.add_argument("--outdoor", type=float, default=5.0, help="°C")
+    parser.add_argument("--sensor-interval", type=float, default=60.0, help="s")
+    parser.add_argument("--sensor-noise", type=float, default=0.05, help="°C")
+    parser.add_argument(
+        "--trv-latency", type=float, default=30.0, help="s until a command applies"
+    )
+    parser.add_argument(
+        "--trv-report", type=float, default=5.0, help="min between TRV reports"
+    )
+    parser.add_argument("--debug", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.debug else logging.WARNING,
+        stream=sys.stderr,
+    )
+
+    with asyncio.Runner(loop_factory=VirtualClockLoop) as runner:
+        report = runner.run(async_simulate(args))
+    print(report)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Tests for the Climate Wrapper integration."""
@@ -0,0 +1,103 @@
+"""Helpers for the Climate Wrapper tests."""
+from __future__ import annotations
+
+import asyncio
+from datetime import timedelta
+from typing import Any
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.setup import async_setup_component
+import homeassistant.util.dt as dt_util
+
+from custom_components.climate_wrapper.const import DOMAIN
+
+CONFIG = {
+    "friendly_name": "Living Room",
+    "wrapped_climate": "climate.trv",
+    "temperature_sensor": "sensor.room",
+    "temperature_variance": 0.5,
+}
+
+
+async def async_setup_wrapper(
+    hass: HomeAssistant,
+    room: float = 19.0,
+    acknowledge: bool = True,
+    **config: Any,
+) -> tuple[MockConfigEntry, list[ServiceCall]]:
+    """Set up a wrapper around a mocked climate and wait for its logic.
+
+    The mocked climate reflects the commands it receives in its state unless
+    acknowledge is False.
+    """
+    calls: list[ServiceCall] = []
+
+    async def async_handle(call: ServiceCall) -> None:
+        calls.append(call)
+        if not acknowledge:
+            return
+        for entity_id in _as_list(call.data["entity_id"]):
+            state = hass.states.get(entity_id)
+            attributes = dict(state.attributes)
+            hvac_mode = call.data.get("hvac_mode", state.state)
+            if "temperature" in call.data:
+                attributes["temperature"] = call.data["temperature"]
+            hass.states.async_set(entity_id, hvac_mode, attributes)
+
+    if "climate" not in hass.config.components:
+        assert await async_setup_component(hass, "climate", {})
+        hass.services.async_register("climate", "set_temperature", async_handle)
+        hass.services.async_register("climate", "set_hvac_mode", async_handle)
+
+    config = {**CONFIG, **config}
+    for entity_id in _as_list(config["wrapped_climate"]):
+        hass.states.async_set(
+            entity_id,
+            "heat",
+            {
+                "current_temperature": 20.0,
+                "temperature": 21.0,
+                "hvac_action": "heating",
+            },
+        )
+    for entity_id in _as_list(config["temperature_sensor"]):
+        hass.states.async_set(entity_id, str(room))
+
+    entry = MockConfigEntry(domain=DOMAIN, data=config)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await async_wait_logic(hass, entry)
+    await async_tick(hass, 5)
+    return entry, calls
+
+
+async def async_wait_logic(hass: HomeAssistant, entry: MockConfigEntry) -> None:
+    """Let the logic start, which happens in the background."""
+    for _ in range(50):
+        if hass.data[DOMAIN][entry.entry_id]["logic"] is not None:
+            break
+        await asyncio.sleep(0)
+
+
+async def async_tick(
+    hass: HomeAssistant, seconds: float, freezer: FrozenDateTimeFactory | None = None
+) -> None:
+    """Let seconds pass, moving the frozen clock along if there is one."""
+    await hass.async_block_till_done()
+    if freezer is not None:
+        freezer.tick(timedelta(seconds=seconds))
+        async_fire_time_changed(hass, dt_util.utcnow())
+    else:
+        async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=seconds))
+    await hass.async_block_till_done()
+
+
+def _as_list(value: str | list[str]) -> list[str]:
+    return [value] if isinstance(value, str) else value
@@ -0,0 +1,74 @@
+"""Tests for the command layer of Climate Wrapper."""
+import asyncio
+from collections.abc import Generator
+from unittest.mock import MagicMock
+
+from freezegun.api import FrozenDateTimeFactory
+import pytest
+
+from homeassistant.components.climate import HVACMode
+from homeassistant.core import HomeAssistant
+
+from custom_components.climate_wrapper.commands import ClimateCommander
+from custom_components.climate_wrapper.const import COMMAND_ACK_TIMEOUT
+from custom_components.climate_wrapper.coordinator import ClimateWrapperCoordinator
+from custom_components.climate_wrapper.state import ClimateState
+
+from .common import async_tick
+
+
+@pytest.fixture
+def commander(hass: HomeAssistant) -> Generator[ClimateCommander, None, None]:
+    """Return a commander of climate.trv with a mocked pipeline."""
+    coordinator = ClimateWrapperCoordinator(hass)
+    yield ClimateCommander(coordinator, "climate.trv", MagicMock())
+    coordinator.async_shutdown()
+
+
+def _observe(hass: HomeAssistant, commander: ClimateCommander, target: float) -> None:
+    hass.states.async_set("climate.trv", HVACMode.HEAT, {"temperature": target})
+    commander.async_observe(ClimateState.from_hass(hass, "climate.trv"))
+
+
+async def test_acknowledged_within_tolerance(
+    hass: HomeAssistant, commander: ClimateCommander
+) -> None:
+    """A reported target close to the commanded one confirms the command."""
+    assert commander.async_set_temperature(21.0)
+    wait = asyncio.create_task(commander.async_wait_acknowledged())
+
+    # Too far off, not this command
+    _observe(hass, commander, 21.5)
+    await asyncio.sleep(0)
+    assert not wait.done()
+    # Same command again is suppressed while pending
+    assert not commander.async_set_temperature(21.0)
+
+    _observe(hass, commander, 21.2)
+    await asyncio.wait_for(wait, 1)
+    assert commander.stats == {
+        "sent": 1,
+        "suppressed": 1,
+        "acknowledged": 1,
+        "expired": 0,
+        "pending": 0,
+    }
+
+
+async def test_expires_without_traffic(
+    hass: HomeAssistant, commander: ClimateCommander, freezer: FrozenDateTimeFactory
+) -> None:
+    """An unconfirmed command expires on time, even if nothing else happens."""
+    assert commander.async_set_hvac_mode(HVACMode.HEAT)
+    wait = asyncio.create_task(commander.async_wait_acknowledged())
+
+    await async_tick(hass, COMMAND_ACK_TIMEOUT - 1, freezer)
+    assert not wait.done()
+    await async_tick(hass, 1, freezer)
+
+    await asyncio.wait_for(wait, 1)
+    assert commander.expired == 1
+    assert commander.stats["pending"] == 0
+    # Now the same command goes out again
+    assert commander.async_set_hvac_mode(HVACMode.HEAT)
+    commander.async_shutdown()
@@ -0,0 +1,58 @@
+"""Tests for the coordinator of Climate Wrapper."""
+from datetime import timedelta
+
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.climate_wrapper.const import DOMAIN
+from custom_components.climate_wrapper.coordinator import ClimateWrapperCoordinator
+
+from .common import async_setup_wrapper, async_tick
+
+
+async def test_batched_deadlines_never_fire_early(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Deadlines close together run in one tick, but not before they are due."""
+    coordinator = ClimateWrapperCoordinator(hass)
+    fired = []
+    coordinator.async_schedule_deadline(10, lambda: fired.append(10))
+    coordinator.async_schedule_deadline(13, lambda: fired.append(13))
+    coordinator.async_schedule_deadline(30, lambda: fired.append(30))
+
+    await async_tick(hass, 10, freezer)
+    assert fired == []
+    await async_tick(hass, 3, freezer)
+    assert fired == [10, 13]
+    await async_tick(hass, 17, freezer)
+    assert fired == [10, 13, 30]
+    coordinator.async_shutdown()
+
+
+async def test_deferred_transition_counted_once(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A transition held by the minimum run time is counted once."""
+    entry, _ = await async_setup_wrapper(hass, room=19.0, min_run_time=5.0)
+    logic = hass.data[DOMAIN][entry.entry_id]["logic"]
+    assert hass.states.get("climate.living_room").attributes["hvac_action"] == "heating"
+
+    hass.states.async_set("sensor.room", "21.0")
+    await async_tick(hass, 5, freezer)
+    await logic.async_refresh()
+    assert logic.deferred_transitions == 1
+
+    # Another deadline just before the window expires must not pull the
+    # re-evaluation forward into the window
+    expires = logic._last_action_change + timedelta(minutes=5)
+    remaining = (expires - dt_util.utcnow()).total_seconds()
+    logic.coordinator.async_schedule_deadline(remaining - 3, lambda: None)
+    await async_tick(hass, remaining - 3, freezer)
+    await async_tick(hass, 3, freezer)
+    await async_tick(hass, 5, freezer)
+
+    assert hass.states.get("climate.living_room").attributes["hvac_action"] == "idle"
+    assert logic.deferred_transitions == 1
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,83 @@
+"""Tests for the decision log of Climate Wrapper."""
+from datetime import timedelta
+from pathlib import Path
+from unittest.mock import patch
+
+from freezegun.api import FrozenDateTimeFactory
+
+from homeassistant.components.climate.const import HVACAction, HVACMode
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.climate_wrapper.decision_log import (
+    RECORD,
+    Command,
+    DecisionLog,
+    Reason,
+)
+
+MAX_RECORDS = 10
+
+
+async def test_round_trip_across_rotation(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory, tmp_path: Path
+) -> None:
+    """Records are read back in order from the backup and the current log."""
+    hass.config.config_dir = str(tmp_path)
+    log = DecisionLog(hass, "test")
+    start = dt_util.utcnow()
+
+    async def async_write(count: int) -> None:
+        for _ in range(count):
+            log.async_record(
+                20.0 + log.records / 10,
+                21.0,
+                HVACAction.HEATING,
+                Command.SET_HVAC_MODE,
+                HVACMode.HEAT,
+                Reason.BELOW_MIN,
+            )
+            freezer.tick(timedelta(minutes=1))
+        await log.async_flush()
+
+    assert RECORD.size == 24
+    with patch(
+        "custom_components.climate_wrapper.decision_log.DECISION_LOG_MAX_SIZE",
+        MAX_RECORDS * RECORD.size,
+    ):
+        await async_write(8)
+        # The next flush does not fit, the log moves to the backup
+        await async_write(4)
+    assert log.rotations == 1
+    assert Path(f"{log.path}.1").stat().st_size == 8 * RECORD.size
+    assert Path(log.path).stat().st_size == 4 * RECORD.size
+
+    # Minutes 6 to 9 span the rotation
+    decisions = await log.async_query(
+        start + timedelta(minutes=6), start + timedelta(minutes=9), 100
+    )
+    assert [decision.timestamp for decision in decisions] == [
+        (start + timedelta(minutes=minute)).timestamp() for minute in range(6, 10)
+    ]
+    assert decisions[0].as_dict() == {
+        "time": (start + timedelta(minutes=6)).isoformat(),
+        "temperature": 20.6,
+        "target": 21.0,
+        "hvac_action": HVACAction.HEATING,
+        "command": "set_hvac_mode",
+        "command_value": HVACMode.HEAT,
+        "reason": "below_min",
+    }
+
+    # The limit keeps the oldest records
+    decisions = await log.async_query(start, start + timedelta(hours=1), 3)
+    assert [decision.timestamp for decision in decisions] == [
+        (start + timedelta(minutes=minute)).timestamp() for minute in range(3)
+    ]
+    # Nothing outside the range
+    assert not await log.async_query(
+        start - timedelta(hours=1), start - timedelta(minutes=1), 100
+    )
+
+    log.async_shutdown()
+    await hass.async_block_till_done()
@@ -0,0 +1,21 @@
+"""Tests for the recorder history reads of Climate Wrapper."""
+from datetime import timedelta
+import importlib
+import sys
+from unittest.mock import patch
+
+from homeassistant.core import HomeAssistant
+
+from custom_components.climate_wrapper import history
+
+
+async def test_no_recorder(hass: HomeAssistant) -> None:
+    """Without the recorder and its requirements there is no history."""
+    with patch.dict(sys.modules, {"homeassistant.components.recorder": None}):
+        importlib.reload(history)
+        assert (
+            await history.async_get_recent_states(
+                hass, "sensor.room", timedelta(hours=1), 10
+            )
+            == []
+        )
@@ -0,0 +1,44 @@
+"""Tests for the setup of Climate Wrapper."""
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.components import persistent_notification
+from homeassistant.const import STATE_UNAVAILABLE
+from homeassistant.core import HomeAssistant
+
+from custom_components.climate_wrapper.const import DOMAIN, ENTITY_AVAILABLE_TIMEOUT
+
+from .common import CONFIG, async_tick, async_wait_logic
+
+
+async def test_start_without_missing_entities(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """A wrapped climate that never shows up does not keep the wrapper down."""
+    hass.states.async_set("sensor.room", "19.0")
+    entry = MockConfigEntry(domain=DOMAIN, data=CONFIG)
+    entry.add_to_hass(hass)
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await async_tick(hass, 5, freezer)
+    assert hass.data[DOMAIN][entry.entry_id]["logic"] is None
+    assert hass.states.get("climate.living_room").state == STATE_UNAVAILABLE
+
+    await async_tick(hass, ENTITY_AVAILABLE_TIMEOUT, freezer)
+    await async_wait_logic(hass, entry)
+    logic = hass.data[DOMAIN][entry.entry_id]["logic"]
+    assert logic is not None
+    await async_tick(hass, 5, freezer)
+    assert hass.states.get("climate.living_room").state != STATE_UNAVAILABLE
+    notifications = persistent_notification._async_get_or_create_notifications(hass)
+    assert (
+        "climate.trv"
+        in notifications[f"{DOMAIN}.{entry.entry_id}.entities_missing"]["message"]
+    )
+
+    # Once it is there, the notification goes away
+    hass.states.async_set(
+        "climate.trv", "heat", {"current_temperature": 20.0, "temperature": 21.0}
+    )
+    await async_tick(hass, 5, freezer)
+    assert not notifications
+    assert await hass.config_entries.async_unload(entry.entry_id)
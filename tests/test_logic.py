@@ -0,0 +1,59 @@
+"""Tests for the control logic of Climate Wrapper."""
+from homeassistant.core import HomeAssistant
+
+from custom_components.climate_wrapper.const import DOMAIN
+
+from .common import async_setup_wrapper, async_tick
+
+
+async def test_leaving_dead_zone_is_evaluated(hass: HomeAssistant) -> None:
+    """A small step out of the dead zone is not held back by filter_threshold."""
+    entry, _ = await async_setup_wrapper(hass, room=19.0, filter_threshold=2.0)
+    logic = hass.data[DOMAIN][entry.entry_id]["logic"]
+    assert hass.states.get("climate.living_room").attributes["hvac_action"] == "heating"
+
+    # Warming up towards the upper switch point at 20.5 changes nothing
+    executed = logic.scheduler.executed
+    for temperature in ("19.6", "20.0", "20.4"):
+        hass.states.async_set("sensor.room", temperature)
+        await async_tick(hass, 5)
+    assert logic.scheduler.executed == executed
+    assert logic.fast_path_samples == 3
+
+    hass.states.async_set("sensor.room", "20.6")
+    await async_tick(hass, 5)
+
+    assert logic.scheduler.executed == executed + 1
+    assert hass.states.get("climate.living_room").attributes["hvac_action"] == "idle"
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_reconfigure_filter_and_sensors(hass: HomeAssistant) -> None:
+    """A new filter applies to the sensors of the same options update."""
+    entry, _ = await async_setup_wrapper(
+        hass, room=19.0, temperature_sensor=["sensor.room", "sensor.other"]
+    )
+    logic = hass.data[DOMAIN][entry.entry_id]["logic"]
+    hass.states.async_set("sensor.new", "21.0")
+
+    executed = logic.scheduler.executed
+    hass.config_entries.async_update_entry(
+        entry,
+        options={
+            **entry.data,
+            "temperature_sensor": ["sensor.room", "sensor.new"],
+            "sensor_filter": "median",
+        },
+    )
+    await async_tick(hass, 5)
+
+    assert set(logic.sensor_filters) == {"sensor.room", "sensor.new"}
+    assert all(f.mode == "median" for f in logic.sensor_filters.values())
+    assert hass.data[DOMAIN][entry.entry_id]["state"].temperature == 20.0
+    assert logic.scheduler.executed == executed + 1
+
+    # The removed sensor is no longer followed
+    hass.states.async_set("sensor.other", "30.0")
+    await async_tick(hass, 5)
+    assert hass.data[DOMAIN][entry.entry_id]["state"].temperature == 20.0
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,92 @@
+"""Tests for the command pipeline of Climate Wrapper."""
+from homeassistant.components.climate.const import (
+    SERVICE_SET_HVAC_MODE,
+    SERVICE_SET_TEMPERATURE,
+)
+from homeassistant.core import HomeAssistant, ServiceCall
+
+from custom_components.climate_wrapper.pipeline import CommandPipeline
+
+
+def _mock_climate_services(hass: HomeAssistant) -> list[ServiceCall]:
+    calls: list[ServiceCall] = []
+
+    async def async_handle(call: ServiceCall) -> None:
+        if call.data["entity_id"] == "climate.broken":
+            raise ValueError("Device unreachable")
+        calls.append(call)
+
+    for service in (SERVICE_SET_HVAC_MODE, SERVICE_SET_TEMPERATURE):
+        hass.services.async_register("climate", service, async_handle)
+    return calls
+
+
+async def test_latest_intent_wins(hass: HomeAssistant) -> None:
+    """Queued intents are merged per entity and service."""
+    calls = _mock_climate_services(hass)
+    pipeline = CommandPipeline(hass, "test")
+
+    pipeline.async_submit(
+        SERVICE_SET_TEMPERATURE, {"entity_id": "climate.a", "temperature": 21}
+    )
+    pipeline.async_submit(
+        SERVICE_SET_HVAC_MODE, {"entity_id": "climate.a", "hvac_mode": "heat"}
+    )
+    pipeline.async_submit(
+        SERVICE_SET_TEMPERATURE, {"entity_id": "climate.b", "temperature": 19}
+    )
+    pipeline.async_submit(
+        SERVICE_SET_TEMPERATURE, {"entity_id": "climate.a", "temperature": 22}
+    )
+    await hass.async_block_till_done()
+
+    # In the order first queued, with the latest data
+    assert [(call.service, dict(call.data)) for call in calls] == [
+        (SERVICE_SET_TEMPERATURE, {"entity_id": "climate.a", "temperature": 22}),
+        (SERVICE_SET_HVAC_MODE, {"entity_id": "climate.a", "hvac_mode": "heat"}),
+        (SERVICE_SET_TEMPERATURE, {"entity_id": "climate.b", "temperature": 19}),
+    ]
+    assert pipeline.stats == {
+        "depth": 0,
+        "max_depth": 3,
+        "submitted": 4,
+        "replaced": 1,
+        "dropped": 0,
+        "sent": 3,
+        "failed": 0,
+    }
+    pipeline.async_shutdown()
+
+
+async def test_full_queue_drops_oldest(hass: HomeAssistant) -> None:
+    """Once the queue is full, the oldest intent makes room."""
+    calls = _mock_climate_services(hass)
+    pipeline = CommandPipeline(hass, "test", maxsize=2)
+
+    for entity_id in ("climate.a", "climate.b", "climate.c"):
+        pipeline.async_submit(
+            SERVICE_SET_TEMPERATURE, {"entity_id": entity_id, "temperature": 20}
+        )
+    await hass.async_block_till_done()
+
+    assert [call.data["entity_id"] for call in calls] == ["climate.b", "climate.c"]
+    assert pipeline.dropped == 1
+    assert pipeline.max_depth == 2
+    pipeline.async_shutdown()
+
+
+async def test_failed_call_counted(hass: HomeAssistant) -> None:
+    """A failing call is counted and does not stop the following ones."""
+    calls = _mock_climate_services(hass)
+    pipeline = CommandPipeline(hass, "test")
+
+    for entity_id in ("climate.broken", "climate.a"):
+        pipeline.async_submit(
+            SERVICE_SET_TEMPERATURE, {"entity_id": entity_id, "temperature": 20}
+        )
+    await hass.async_block_till_done()
+
+    assert [call.data["entity_id"] for call in calls] == ["climate.a"]
+    assert pipeline.failed == 1
+    assert pipeline.sent == 1
+    pipeline.async_shutdown()
@@ -0,0 +1,120 @@
+"""Tests for the predictive control of Climate Wrapper."""
+from datetime import timedelta
+from pathlib import Path
+import random
+import re
+import subprocess
+import sys
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.climate_wrapper.const import (
+    CONTROL_MODE_HYSTERESIS,
+    CONTROL_MODE_PREDICTIVE,
+    PREDICTIVE_MIN_BAND,
+)
+from custom_components.climate_wrapper.predictive import (
+    PredictiveControl,
+    ThermalModel,
+)
+
+SIMULATE = Path(__file__).parent.parent / "scripts" / "simulate.py"
+
+
+@pytest.mark.parametrize("heating", [True, False])
+def test_rates_not_biased_by_noise(heating: bool) -> None:
+    """Noisy samples do not push the learned rates up."""
+    rng = random.Random(0)
+    model = ThermalModel()
+    start = dt_util.utcnow()
+    slope = 0.02 if heating else -0.02  # °C/min
+    for minute in range(600):
+        temperature = 20 + slope * minute + rng.gauss(0, 0.05)
+        model.add_sample(temperature, start + timedelta(minutes=minute), heating)
+
+    rate = model.heating_rate if heating else model.cooling_rate
+    assert rate == pytest.approx(0.02, abs=0.005)
+
+
+def test_fit_starts_over_on_action_change() -> None:
+    """Samples of a heating phase are not fitted into the cooling rate."""
+    model = ThermalModel()
+    start = dt_util.utcnow()
+    for minute in range(30):
+        model.add_sample(20 + 0.1 * minute, start + timedelta(minutes=minute), True)
+    heating_rate = model.heating_rate
+    for minute in range(30, 35):
+        model.add_sample(23 - 0.02 * minute, start + timedelta(minutes=minute), False)
+
+    assert model.heating_rate == heating_rate
+    assert model.cooling_rate == 0.05  # Not enough cooling samples yet
+
+
+async def test_switch_points_move_in(hass: HomeAssistant) -> None:
+    """Heating starts early by the cooling and stops early by the heating rate."""
+    control = PredictiveControl(hass, "test", lookahead=10)
+    control.model = ThermalModel(heating_rate=0.02, cooling_rate=0.01)
+
+    assert control.switch_points(19.5, 20.5) == pytest.approx((19.6, 20.3))
+    assert control.should_heat(False, 19.59, 19.5, 20.5)
+    assert not control.should_heat(False, 19.61, 19.5, 20.5)
+    assert control.should_heat(True, 20.29, 19.5, 20.5)
+    assert not control.should_heat(True, 20.31, 19.5, 20.5)
+
+
+async def test_switch_points_keep_min_band(hass: HomeAssistant) -> None:
+    """However fast the room is, PREDICTIVE_MIN_BAND of the band remains."""
+    control = PredictiveControl(hass, "test", lookahead=10)
+    control.model = ThermalModel(heating_rate=0.3, cooling_rate=0.1)
+
+    start_at, stop_at = control.switch_points(19.5, 20.5)
+    assert stop_at - start_at == pytest.approx(PREDICTIVE_MIN_BAND * (20.5 - 19.5))
+    # The offsets keep their proportion
+    assert (20.5 - stop_at) == pytest.approx(3 * (start_at - 19.5))
+
+
+def _simulate(control_mode: str, *args: str) -> dict[str, float]:
+    """Run the simulator for a week and return the figures of its report."""
+    result = subprocess.run(
+        [
+            sys.executable,
+            str(SIMULATE),
+            "--days",
+            "7",
+            "--control-mode",
+            control_mode,
+            *args,
+        ],
+        capture_output=True,
+        check=True,
+        text=True,
+        timeout=300,
+    )
+    return {
+        name: float(value)
+        for name, value in re.findall(r"^([\w ]+):\s+(-?[\d.]+)", result.stdout, re.M)
+    }
+
+
+@pytest.mark.parametrize("sensor_noise", ["0.05", "0"])
+def test_predictive_reduces_overshoot(sensor_noise: str) -> None:
+    """In the simulated room, predictive control overshoots less.
+
+    It must not get there by lowering the temperature: the undershoot does
+    not grow and the mean temperature gets closer to the target.
+    """
+    args = ("--sensor-noise", sensor_noise, "--target", "20")
+    hysteresis = _simulate(CONTROL_MODE_HYSTERESIS, *args)
+    predictive = _simulate(CONTROL_MODE_PREDICTIVE, *args)
+
+    assert predictive["Overshoot"] < hysteresis["Overshoot"] * 0.75
+    assert predictive["Undershoot"] <= hysteresis["Undershoot"]
+    assert abs(predictive["Mean room temperature"] - 20) < abs(
+        hysteresis["Mean room temperature"] - 20
+    )
+    # Paid for with a narrower band, but within bounds
+    assert predictive["Relay cycles per day"] < hysteresis["Relay cycles per day"] * 1.5
+    assert predictive["Evaluations"] <= hysteresis["Evaluations"]
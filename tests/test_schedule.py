@@ -0,0 +1,132 @@
+"""Tests for the schedule of Climate Wrapper."""
+from datetime import datetime
+
+import pytest
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.climate_wrapper.schedule import Timeline
+
+ALL_DAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+
+@pytest.fixture(autouse=True)
+def berlin(hass: HomeAssistant) -> None:
+    """Schedule in a time zone with daylight saving time."""
+    hass.config.set_time_zone("Europe/Berlin")
+
+
+def _local(*args: int) -> datetime:
+    return datetime(*args, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+
+
+def _utc(*args: int) -> datetime:
+    return datetime(*args, tzinfo=dt_util.UTC)
+
+
+def test_block_past_midnight() -> None:
+    """A block ending before it starts continues the next day, Sunday into Monday."""
+    timeline = Timeline(
+        {
+            "weekly": [
+                {
+                    "days": ["fri", "sun"],
+                    "start": "22:00",
+                    "end": "02:00",
+                    "temperature": 17,
+                }
+            ],
+            "default": 20,
+        }
+    )
+
+    # Friday 2026-10-23 into Saturday
+    assert timeline.setpoint(_local(2026, 10, 23, 21, 59)) == 20
+    assert timeline.setpoint(_local(2026, 10, 23, 22, 0)) == 17
+    assert timeline.setpoint(_local(2026, 10, 24, 1, 59)) == 17
+    assert timeline.setpoint(_local(2026, 10, 24, 2, 0)) == 20
+    # Sunday 2026-10-18 into Monday, across the end of the week
+    assert timeline.setpoint(_local(2026, 10, 18, 23, 0)) == 17
+    assert timeline.setpoint(_local(2026, 10, 19, 1, 0)) == 17
+    assert timeline.next_transition(_local(2026, 10, 18, 23, 0)) == _local(
+        2026, 10, 19, 2, 0
+    )
+
+
+def test_dst_transitions() -> None:
+    """Transitions stay at their local time when the clocks change."""
+    timeline = Timeline(
+        {
+            "weekly": [
+                {"days": ALL_DAYS, "start": "02:30", "end": "06:00", "temperature": 17}
+            ],
+            "default": 20,
+        }
+    )
+
+    # Clocks go forward at 02:00 on 2026-03-29: 02:30 does not exist, the
+    # transition happens as soon as the clock is past it
+    assert timeline.next_transition(_utc(2026, 3, 28, 23, 0)) == _utc(
+        2026, 3, 29, 1, 30
+    )
+    assert timeline.setpoint(_local(2026, 3, 29, 3, 15)) == 17
+    # and 06:00 is in summer time
+    assert timeline.next_transition(_utc(2026, 3, 29, 1, 30)) == _utc(2026, 3, 29, 4, 0)
+
+    # Clocks go back at 03:00 on 2026-10-25: 02:30 comes twice; in the
+    # repeated hour before it, the transition is the second 02:30
+    assert timeline.next_transition(_utc(2026, 10, 24, 23, 0)) == _utc(
+        2026, 10, 25, 0, 30
+    )
+    assert timeline.next_transition(_utc(2026, 10, 25, 1, 10)) == _utc(
+        2026, 10, 25, 1, 30
+    )
+    # and 06:00 is in winter time
+    assert timeline.next_transition(_utc(2026, 10, 25, 1, 30)) == _utc(
+        2026, 10, 25, 5, 0
+    )
+
+
+def test_precedence() -> None:
+    """Overrides beat holidays, holidays beat the weekly blocks, later beats earlier."""
+    timeline = Timeline(
+        {
+            "weekly": [
+                {"days": ALL_DAYS, "start": "06:00", "end": "22:00", "temperature": 21}
+            ],
+            "default": 18,
+            "holidays": [
+                {
+                    "start": "2026-10-19T00:00:00+02:00",
+                    "end": "2026-10-24T00:00:00+02:00",
+                    "temperature": 16,
+                }
+            ],
+            "overrides": [
+                {
+                    "start": "2026-10-20T12:00:00+02:00",
+                    "end": "2026-10-20T14:00:00+02:00",
+                    "temperature": 23,
+                },
+                {
+                    "start": "2026-10-20T13:00:00+02:00",
+                    "end": "2026-10-20T15:00:00+02:00",
+                    "temperature": 22,
+                },
+            ],
+        }
+    )
+
+    assert timeline.setpoint(_local(2026, 10, 18, 12, 0)) == 21
+    assert timeline.setpoint(_local(2026, 10, 19, 12, 0)) == 16
+    assert timeline.setpoint(_local(2026, 10, 20, 12, 30)) == 23
+    assert timeline.setpoint(_local(2026, 10, 20, 13, 30)) == 22
+    assert timeline.setpoint(_local(2026, 10, 20, 14, 30)) == 22
+    assert timeline.setpoint(_local(2026, 10, 20, 15, 30)) == 16
+    # Back to the weekly blocks once the holidays are over
+    assert timeline.setpoint(_local(2026, 10, 24, 5, 0)) == 18
+    assert timeline.setpoint(_local(2026, 10, 24, 12, 0)) == 21
+    assert timeline.next_transition(_local(2026, 10, 20, 11, 0)) == _local(
+        2026, 10, 20, 12, 0
+    )
@@ -0,0 +1,95 @@
+"""Tests for the update scheduler of Climate Wrapper."""
+import asyncio
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.climate_wrapper.scheduler import UpdateScheduler
+
+from .common import async_tick
+
+
+async def test_burst_runs_once(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Requests within the debounce window are merged into one evaluation."""
+    runs = 0
+
+    async def async_update() -> None:
+        nonlocal runs
+        runs += 1
+
+    scheduler = UpdateScheduler(hass, async_update, debounce=2)
+    for _ in range(5):
+        scheduler.async_schedule()
+        await async_tick(hass, 0.1, freezer)
+    assert runs == 0
+
+    await async_tick(hass, 2, freezer)
+    assert runs == 1
+    assert scheduler.stats == {"requested": 5, "coalesced": 4, "executed": 1}
+
+    # Nothing left over
+    await async_tick(hass, 10, freezer)
+    assert runs == 1
+
+
+async def test_refresh_during_run_runs_once_more(hass: HomeAssistant) -> None:
+    """Refreshes arriving while an evaluation runs share one more evaluation."""
+    runs = 0
+    release = asyncio.Event()
+
+    async def async_update() -> None:
+        nonlocal runs
+        runs += 1
+        await release.wait()
+
+    scheduler = UpdateScheduler(hass, async_update, debounce=2)
+    refreshes = [asyncio.create_task(scheduler.async_refresh())]
+    await asyncio.sleep(0)
+    assert runs == 1
+
+    refreshes += [asyncio.create_task(scheduler.async_refresh()) for _ in range(3)]
+    # Absorbed by the queued evaluation as well
+    scheduler.async_schedule()
+    await asyncio.sleep(0)
+
+    release.set()
+    await asyncio.gather(*refreshes)
+    assert runs == 2
+    assert scheduler.stats == {"requested": 5, "coalesced": 3, "executed": 2}
+    await hass.async_block_till_done()
+    assert runs == 2
+
+
+async def test_schedule_during_run_runs_once_more(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """Requests arriving while a timed evaluation runs cause exactly one more."""
+    runs = 0
+    release = asyncio.Event()
+
+    async def async_update() -> None:
+        nonlocal runs
+        runs += 1
+        await release.wait()
+
+    scheduler = UpdateScheduler(hass, async_update, debounce=2)
+    scheduler.async_schedule()
+    freezer.tick(2)
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await asyncio.sleep(0)
+    assert runs == 1
+
+    scheduler.async_schedule()
+    scheduler.async_schedule()
+    release.set()
+    await async_tick(hass, 2, freezer)
+    assert runs == 2
+    assert scheduler.stats == {"requested": 3, "coalesced": 1, "executed": 2}
+
+    await async_tick(hass, 10, freezer)
+    assert runs == 2
@@ -0,0 +1,72 @@
+"""Tests for the services of Climate Wrapper."""
+import asyncio
+
+from freezegun.api import FrozenDateTimeFactory
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from homeassistant.components.climate import ATTR_HVAC_MODE, HVACMode
+from homeassistant.core import HomeAssistant
+import homeassistant.util.dt as dt_util
+
+from custom_components.climate_wrapper.const import (
+    DOMAIN,
+    SERVICE_SET_MANY,
+    SET_MANY_CONCURRENCY,
+    SET_MANY_TIMEOUT,
+)
+
+from .common import async_setup_wrapper
+
+
+async def _async_run_loop() -> None:
+    """Let the event loop run the tasks that are ready."""
+    for _ in range(50):
+        await asyncio.sleep(0)
+
+
+async def test_set_many_waits_one_timeout(
+    hass: HomeAssistant, freezer: FrozenDateTimeFactory
+) -> None:
+    """All entries share one acknowledge deadline, those waiting their turn too."""
+    rooms = range(SET_MANY_CONCURRENCY + 2)
+    for room in rooms:
+        _, room_calls = await async_setup_wrapper(
+            hass,
+            acknowledge=False,
+            friendly_name=f"Room {room}",
+            wrapped_climate=f"climate.trv_{room}",
+            temperature_sensor=f"sensor.room_{room}",
+        )
+        if room == 0:
+            # The climate services are mocked once, by the first setup
+            calls = room_calls
+    calls.clear()
+
+    call = asyncio.create_task(
+        hass.services.async_call(
+            DOMAIN,
+            SERVICE_SET_MANY,
+            {
+                "entity_id": [f"climate.room_{room}" for room in rooms],
+                ATTR_HVAC_MODE: HVACMode.OFF,
+            },
+            blocking=True,
+            return_response=True,
+        )
+    )
+    await _async_run_loop()
+    commanded = {call.data["entity_id"] for call in calls}
+    assert len(commanded) == SET_MANY_CONCURRENCY
+    assert not call.done()
+
+    freezer.tick(SET_MANY_TIMEOUT)
+    async_fire_time_changed(hass, dt_util.utcnow())
+    await _async_run_loop()
+
+    assert call.done()
+    assert call.result() == {
+        f"climate.room_{room}": {"acknowledged": False} for room in rooms
+    }
+    # The entries that had to wait are commanded all the same
+    commanded = {call.data["entity_id"] for call in calls}
+    assert commanded == {f"climate.trv_{room}" for room in rooms}
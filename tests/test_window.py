@@ -0,0 +1,19 @@
+"""Tests for the open window detection of Climate Wrapper."""
+import pytest
+
+from custom_components.climate_wrapper.window import SlopeWindow
+
+
+def test_slope_window_rebases_on_eviction() -> None:
+    """The sums stay relative to the oldest sample as the window slides."""
+    window = SlopeWindow(600)
+    start = 1.7e9
+    for second in range(0, 86400, 60):
+        window.add(20 + 0.001 * second, start + second)
+
+    assert len(window) == 11
+    assert window.span == 600
+    assert window.slope == pytest.approx(0.001)
+    # A sample leaves the window on every add, so the origin is the oldest one
+    assert window._origin == start + 86400 - 60 - 600
+    assert 0 <= window._sum_x <= len(window) * window.span